@@ -0,0 +1,274 @@
+"""Micro-benchmarks for the extraction hot paths.
+
+Runs every case over the saved pages in ``bench/fixtures`` and reports
+throughput (calls per second) and peak allocation per call (tracemalloc).
+
+    python -m bench.extraction                    # print results
+    python -m bench.extraction --save-baseline    # write bench/baseline.json
+    python -m bench.extraction --compare          # fail on regressions vs baseline
+    python -m bench.extraction --parser html.parser --case keywords
+
+Baselines are machine specific and are not committed: record one on the
+machine you compare on. Throughput is compared relative to a calibration
+workload (stdlib ``html.parser`` over the fixtures) timed in the same run,
+so a machine that is uniformly slower or busier does not read as a
+regression.
+``--check-parity`` also verifies that every installed parser backend gives
+the same extraction results on each fixture.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from html.parser import HTMLParser
+
+from tools import academy_search, google_search, helpcenter_search, html_parser, keyword_matcher
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+KEYWORDS_FILE = os.path.join(os.path.dirname(BENCH_DIR), "example_data", "keywords.json")
+
+MIN_TIME = 0.2      # seconds each timing repeat should last at least
+REPEATS = 7         # the median of N repeats is reported
+SPEED_TOLERANCE = 0.30   # allowed drop in calibrated throughput vs baseline
+MEMORY_TOLERANCE = 0.25  # allowed peak-allocation growth vs baseline
+LARGE_KEYWORD_COUNT = 200
+
+
+# =======================
+# FIXTURES & INPUTS
+# =======================
+def load_fixtures():
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+                fixtures[name[:-5]] = f.read()
+    return fixtures
+
+
+def keyword_sets(fixtures):
+    with open(KEYWORDS_FILE, "r", encoding="utf-8") as f:
+        small = json.load(f)
+    # A large, deterministic set of word pairs taken from the fixtures themselves.
+    words = sorted({w.lower() for markup in fixtures.values() for w in html_parser.html_to_text(markup).split() if w.isalpha()})
+    large = []
+    for i, first in enumerate(words):
+        for second in words[i + 1:i + 4]:
+            large.append(f"{first} {second}")
+    large = (small + academy_search.KEYWORDS + large)[:LARGE_KEYWORD_COUNT]
+    return {"small": small + academy_search.KEYWORDS, "large": large}
+
+
+def _naive_count(text, keywords):
+    lowered = text.lower()
+    return {kw: lowered.count(kw.lower()) for kw in keywords}
+
+
+# =======================
+# CASES
+# =======================
+def build_cases(fixtures, parser):
+    """Return ``{case: {fixture: callable}}`` with inputs prepared up front."""
+    soups = {name: html_parser.make_soup(markup, parser) for name, markup in fixtures.items()}
+    texts = {name: soup.get_text(" ", strip=True) for name, soup in soups.items()}
+    sets = keyword_sets(fixtures)
+    matchers = {size: keyword_matcher.KeywordMatcher(kws) for size, kws in sets.items()}
+
+    def per_fixture(make):
+        return {name: make(name) for name in fixtures}
+
+    cases = {
+        "parse_soup": per_fixture(lambda n: lambda: html_parser.make_soup(fixtures[n], parser)),
+        "get_text": per_fixture(lambda n: lambda: soups[n].get_text(" ", strip=True)),
+        "metadata_head_parser": per_fixture(
+            lambda n: lambda: google_search._extract_metadata(google_search.parse_head(fixtures[n]))),
+        "metadata_soup": per_fixture(
+            lambda n: lambda: google_search._extract_metadata(google_search._SoupHead(html_parser.make_soup(fixtures[n], parser)))),
+        "extract_dates": per_fixture(lambda n: lambda: helpcenter_search._extract_dates(soups[n])),
+        "extract_topic": per_fixture(lambda n: lambda: helpcenter_search._extract_topic(soups[n])),
+        "extract_summary": per_fixture(lambda n: lambda: helpcenter_search._extract_summary(soups[n])),
+        "json_ld_dates": per_fixture(lambda n: lambda: helpcenter_search._parse_json_ld_dates(soups[n])),
+    }
+    for size, kws in sets.items():
+        cases[f"keywords_matcher_{size}"] = per_fixture(lambda n, m=matchers[size]: lambda: m.count(texts[n]))
+        cases[f"keywords_naive_{size}"] = per_fixture(lambda n, k=kws: lambda: _naive_count(texts[n], k))
+    return cases
+
+
+# =======================
+# MEASUREMENT
+# =======================
+def _time_per_call(fn):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def _peak_kib(fn):
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - base) / 1024
+
+
+def measure(fn):
+    fn()  # warm caches and lazy imports
+    per_call = _time_per_call(fn)
+    return {"ops_per_sec": round(1 / per_call, 1), "peak_kib": round(_peak_kib(fn), 1)}
+
+
+def calibrate(fixtures):
+    """Throughput of a fixed stdlib workload, used to normalize speed comparisons."""
+    def workload():
+        for markup in fixtures.values():
+            parser = HTMLParser()
+            parser.feed(markup)
+            parser.close()
+    ops = round(1 / _time_per_call(workload), 1)
+    print(f"  {'calibration':<28} {'all fixtures':<22} {ops:>12,.1f} ops/s")
+    return ops
+
+
+def run(cases, only=None):
+    results = {}
+    for case, fixtures in cases.items():
+        if only and not any(o in case for o in only):
+            continue
+        results[case] = {}
+        for fixture, fn in fixtures.items():
+            results[case][fixture] = measure(fn)
+            r = results[case][fixture]
+            print(f"  {case:<28} {fixture:<22} {r['ops_per_sec']:>12,.1f} ops/s {r['peak_kib']:>10,.1f} KiB peak")
+    return results
+
+
+# =======================
+# BASELINE & PARITY
+# =======================
+def compare(results, baseline, scale=1.0):
+    """Return a list of regression messages (empty when within tolerance).
+
+    ``scale`` is this run's calibration throughput over the baseline's;
+    throughput ratios are divided by it before the tolerance is applied.
+    """
+    regressions = []
+    for case, fixtures in results.items():
+        for fixture, now in fixtures.items():
+            before = baseline.get(case, {}).get(fixture)
+            if not before:
+                continue
+            speed = now["ops_per_sec"] / before["ops_per_sec"] / scale - 1
+            memory = (now["peak_kib"] / before["peak_kib"] - 1) if before["peak_kib"] else 0
+            label = f"{case}/{fixture}"
+            print(f"  {label:<52} speed {speed:+7.1%}   peak {memory:+7.1%}")
+            if speed < -SPEED_TOLERANCE:
+                regressions.append(f"{label}: throughput {speed:+.1%}")
+            if memory > MEMORY_TOLERANCE:
+                regressions.append(f"{label}: peak allocation {memory:+.1%}")
+    return regressions
+
+
+def _extract_all(markup, parser):
+    soup = html_parser.make_soup(markup, parser)
+    return {
+        "dates": helpcenter_search._extract_dates(soup),
+        "topic": helpcenter_search._extract_topic(soup),
+        "summary": helpcenter_search._extract_summary(soup),
+        "metadata": google_search._extract_metadata(google_search._SoupHead(soup)),
+        "text": soup.get_text(" ", strip=True),
+    }
+
+
+def check_parity(fixtures):
+    """Compare extraction results across installed parser backends."""
+    backends = html_parser.available_backends()
+    mismatches = []
+    for name, markup in fixtures.items():
+        reference = _extract_all(markup, backends[0])
+        head_meta = google_search._extract_metadata(google_search.parse_head(markup))
+        if head_meta != reference["metadata"]:
+            mismatches.append(f"{name}: HeadParser metadata differs from {backends[0]}")
+        for backend in backends[1:]:
+            other = _extract_all(markup, backend)
+            for field, value in reference.items():
+                if other[field] != value:
+                    mismatches.append(f"{name}: {field} differs between {backends[0]} and {backend}")
+    return mismatches
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Extraction micro-benchmarks")
+    ap.add_argument("--parser", default=None, help="html_parser backend (default: configured)")
+    ap.add_argument("--case", action="append", help="Only run cases whose name contains this (repeatable)")
+    ap.add_argument("--save-baseline", action="store_true", help=f"Write results to {os.path.relpath(BASELINE_FILE)}")
+    ap.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regression")
+    ap.add_argument("--check-parity", action="store_true", help="Check extraction results match across parser backends")
+    args = ap.parse_args(argv)
+
+    fixtures = load_fixtures()
+    parser = html_parser.backend_name(args.parser)
+    print(f"📏 Benchmarking {len(fixtures)} fixture(s) with parser '{parser}'")
+    calibration = calibrate(fixtures)
+    results = run(build_cases(fixtures, parser), args.case)
+
+    status = 0
+    if args.check_parity:
+        mismatches = check_parity(fixtures)
+        for m in mismatches:
+            print(f"❌ {m}")
+        if mismatches:
+            status = 1
+        else:
+            print(f"✅ Extraction results identical across {', '.join(html_parser.available_backends())}")
+
+    if args.compare:
+        try:
+            with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"❌ No baseline at {BASELINE_FILE}; run with --save-baseline first.")
+            return 1
+        if baseline.get("parser") != parser:
+            print(f"⚠️ Baseline was recorded with parser '{baseline.get('parser')}', not '{parser}'.")
+        scale = calibration / baseline["calibration"] if baseline.get("calibration") else 1.0
+        print(f"  Machine speed vs baseline (calibration): {scale - 1:+.1%}")
+        regressions = compare(results, baseline.get("results", {}), scale)
+        for r in regressions:
+            print(f"❌ Regression: {r}")
+        if regressions:
+            status = 1
+        else:
+            print("✅ No regressions against the baseline.")
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"parser": parser, "python": sys.version.split()[0], "calibration": calibration, "results": results}, f, indent=2)
+        print(f"✅ Baseline saved to {BASELINE_FILE}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,9 @@ CSE_ID = "YOUR_GOOGLE_CUSTOM_SEARCH_ENGINE_ID_HERE"
 REDDIT_CLIENT_ID = "YOUR_REDDIT_CLIENT_ID_HERE"
 REDDIT_CLIENT_SECRET = "YOUR_REDDIT_CLIENT_SECRET_HERE"
 REDDIT_USER_AGENT = "YOUR_USER_AGENT_DESCRIPTION_HERE"
+REDDIT_COMMENT_WORKERS = 4  # concurrent top-comment fetches, paced by Reddit's X-Ratelimit-* budget
+REDDIT_AUTHOR_TTL_DAYS = 7  # how long cached author karma / account age stay fresh (data/reddit_authors.json)
+REDDIT_REFRESH_MAX_AGE_DAYS = 3  # eng:fud-scan refreshes scores of stored posts up to this age (data/reddit_posts.db)
 
 LOOKBACK_DAYS = 60
 INDEX_TRACK_COUNT = 2
@@ -17,3 +20,20 @@ LLM_PROVIDERS = {
     # "gemini": {"api_key": ""},
 }
 
+
+# Shared HTTP client (tools/http_client.py)
+HTTP_POOL_CONNECTIONS = 20  # hosts kept alive
+HTTP_POOL_MAXSIZE = 10      # keep-alive connections per host
+HTTP_TIMEOUT = 20           # seconds
+HTTP_HEAD_MAX_BYTES = 131072  # byte cap for head-only metadata fetches
+HTTP_CACHE_ENABLED = True   # revalidate pages with ETag / Last-Modified (data/http_cache/)
+HTTP_CACHE_MAX_AGE_DAYS = 30  # evict cache entries unused for this long
+HTTP_CACHE_MAX_BYTES = 536870912  # then least recently used ones above this size
+
+# Per-host / per-API rate limits (tools/rate_limit.py), merged over the defaults there.
+# RATE_LIMITS = {
+#     "support.ledger.com": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+#     "reddit": {"rate": 100 / 60, "burst": 10, "max_concurrency": 4},
+# }
+HTML_PARSER = "auto"        # "auto" (lxml when installed), "lxml" or "html.parser"
+ACADEMY_SITEMAP_URL = "https://www.ledger.com/sitemap_index.xml"  # sitemap index for academy discovery
@@ -7,7 +7,7 @@ import time
 # Ensure tools directory is in path
 sys.path.append(os.path.join(os.path.dirname(__file__), "tools"))
 
-from tools import cli, scheduler, storage, reddit_search, sentiment, themes, geo, seo
+from tools import cli, scheduler, storage, reddit_search, reddit_store, sentiment, themes, geo, seo, helpcenter_search, academy_search, event_log
 # ---------------------------------------------------------------------------
 # Engagement utilities
 # ---------------------------------------------------------------------------
@@ -48,18 +48,18 @@ def run_eng_brand_activity(users_file: str, lookback: int):
     storage.write_json(out_path, rows)
     print(f"Saved activity for {len(users)} user(s) to {out_path}")
 
-def run_eng_fud_scan(subs_file: str, lookback: int, limit: int, rules_file: str):
+def run_eng_fud_scan(subs_file: str, lookback: int, limit: int, rules_file: str, refresh: bool = True):
     reddit = reddit_search.init_reddit_client()
     subreddits = storage.load_json(subs_file, [])
     rules = themes.load_rules(rules_file) if os.path.exists(rules_file) else {}
     start_ts = int(time.time()) - lookback * 24 * 3600
+    store = reddit_store.RedditStore()
     results = []
     for sub in subreddits:
-        df = reddit_search.scrape_reddit(
-            reddit, keywords=[], limit=limit, subreddit=sub, start_ts=start_ts,
-            highlight_terms=None, fetch_comments=False
-        )
-        for row in df.to_dict('records'):
+        reddit_store.sync_subreddit(reddit, store, sub, start_ts, limit=limit)
+        if refresh:
+            reddit_store.refresh_scores(reddit, store, sub, start_ts)
+        for row in store.posts_since(sub, start_ts):
             text = f"{row.get('title', '')} {row.get('content', '')}"
             tone = sentiment.tone_from_text(text)
             theme = themes.classify(text, rules) if rules else None
@@ -103,9 +103,27 @@ def parse_args():
     sp_fud = sub.add_parser('eng:fud-scan', help='Scan subreddits for negative sentiment')
     sp_fud.add_argument('--subreddits', required=True, help='Path to subreddits JSON file')
     sp_fud.add_argument('--lookback', type=int, default=14, help='Lookback window in days')
-    sp_fud.add_argument('--limit', type=int, default=400, help='Posts to fetch per subreddit')
+    sp_fud.add_argument('--limit', type=int, default=400, help='New posts to fetch per subreddit per run')
+    sp_fud.add_argument('--no-refresh', action='store_true', help='Skip refreshing scores of recent stored posts')
     sp_fud.add_argument('--rules', default=os.path.join('data', 'theme_rules.json'), help='Path to theme rules JSON')
 
+    sp_hc = sub.add_parser('helpcenter:scrape', help='Sync, scrape and export help center articles')
+    sp_hc.add_argument('--workers', type=int, default=helpcenter_search.HELPCENTER_WORKERS, help='Articles scraped in parallel')
+    sp_hc.add_argument('--no-prefetch', action='store_true', help='Skip the bulk Zendesk article prefetch')
+    sp_hc.add_argument('--incremental', action='store_true', help='Only re-extract articles that changed since the last run')
+    sp_hc.add_argument('--resume', action='store_true', help='Continue an interrupted run after the last completed article')
+    sp_hc.add_argument('--retry-failed', action='store_true', help='Only re-scrape the URLs that failed in the previous run')
+
+    sp_ac = sub.add_parser('academy:scan', help='Sync, scrape and export Ledger Academy articles')
+    sp_ac.add_argument('--incremental', action='store_true', help='Only re-extract articles that changed since the last run')
+    sp_ac.add_argument('--resume', action='store_true', help='Continue an interrupted run after the last completed article')
+    sp_ac.add_argument('--retry-failed', action='store_true', help='Only re-scan the URLs that failed in the previous run')
+    sp_ac.add_argument('--sitemap', action='store_true', help='Discover articles from the sitemap and scan only new or modified ones')
+
+    sp_fail = sub.add_parser('scrape:failures', help='Summarize scraper failures by reason and host')
+    sp_fail.add_argument('source', choices=['helpcenter', 'academy'], help='Which scraper log to read')
+    sp_fail.add_argument('--all-runs', action='store_true', help='Include failures from every run, not just the latest')
+
     sub.add_parser('scheduler', help='Run scheduled jobs')
 
     return parser.parse_args()
@@ -135,7 +153,16 @@ def main():
     elif args.command == 'eng:brand-activity':
         run_eng_brand_activity(args.users, args.lookback)
     elif args.command == 'eng:fud-scan':
-        run_eng_fud_scan(args.subreddits, args.lookback, args.limit, args.rules)
+        run_eng_fud_scan(args.subreddits, args.lookback, args.limit, args.rules, refresh=not args.no_refresh)
+    elif args.command == 'helpcenter:scrape':
+        retry = event_log.failed_urls(helpcenter_search.LOG_FILE) if args.retry_failed else None
+        helpcenter_search.run_helpcenter_scrape(workers=args.workers, prefetch=not args.no_prefetch, incremental=args.incremental, resume=args.resume, only_urls=retry)
+    elif args.command == 'academy:scan':
+        retry = event_log.failed_urls(academy_search.LOG_FILE) if args.retry_failed else None
+        academy_search.run_academy_keyword_scan(incremental=args.incremental, resume=args.resume, only_urls=retry, use_sitemap=args.sitemap)
+    elif args.command == 'scrape:failures':
+        module = helpcenter_search if args.source == 'helpcenter' else academy_search
+        event_log.print_summary(module.LOG_FILE, all_runs=args.all_runs)
     elif args.command == 'scheduler':
         run_scheduler()
 
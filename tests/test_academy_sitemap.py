@@ -0,0 +1,32 @@
+"""Sitemap discovery matches sitemap entries to stored articles by their
+canonical link, so an unchanged lastmod is recognized whatever the spelling."""
+from tools import academy_search, article_store, urls
+
+LINK = "https://www.ledger.com/academy/what-is-a-seed"
+
+
+def _store(monkeypatch, tmp_path, lastmod):
+    store = article_store.ArticleStore(str(tmp_path / "academy.db"), key_field="link", canonicalize=urls.canonicalize)
+    store.upsert({"link": LINK, "title": "Seed", "sitemap_lastmod": lastmod})
+    monkeypatch.setattr(academy_search, "_store", store)
+    return store
+
+
+def test_unchanged_article_is_skipped_under_another_spelling(monkeypatch, tmp_path):
+    _store(monkeypatch, tmp_path, "2024-01-01")
+    monkeypatch.setattr(academy_search.sitemap, "iter_urls", lambda index_url: iter([
+        ("HTTPS://WWW.LEDGER.COM/academy/what-is-a-seed?utm_source=sitemap", "2024-01-01"),
+    ]))
+    assert academy_search.discover_from_sitemap() == {}
+
+
+def test_changed_and_new_articles_are_keyed_canonically(monkeypatch, tmp_path):
+    store = _store(monkeypatch, tmp_path, "2024-01-01")
+    monkeypatch.setattr(academy_search.sitemap, "iter_urls", lambda index_url: iter([
+        ("https://www.ledger.com/academy/what-is-a-seed#top", "2024-02-01"),
+        ("https://WWW.ledger.com/academy/new-article?utm_medium=x", "2024-02-02"),
+        ("https://www.ledger.com/academy/new-article", "2024-02-02"),
+    ]))
+    changed = academy_search.discover_from_sitemap()
+    assert changed == {LINK: "2024-02-01", "https://www.ledger.com/academy/new-article": "2024-02-02"}
+    assert len(store) == 2
@@ -0,0 +1,22 @@
+"""Incremental runs refresh the saved Zendesk article index with only the
+articles changed since it was fetched."""
+from tools import helpcenter_search
+
+
+def test_incremental_index_reads_only_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(helpcenter_search, "INDEX_FILE", str(tmp_path / "index.json"))
+    calls = []
+
+    def fake_prefetch(since=None, locale="en-us"):
+        calls.append(since)
+        if since is None:
+            return {"1": {"id": 1, "title": "Old"}, "2": {"id": 2, "title": "Kept"}}
+        return {"1": {"id": 1, "title": "New", "locale": locale}, "3": {"id": 3, "title": "Other", "locale": "fr"}}
+
+    monkeypatch.setattr(helpcenter_search, "prefetch_articles", fake_prefetch)
+    full = helpcenter_search.load_article_index(incremental=True, locale="en-us")
+    assert set(full) == {"1", "2"} and calls == [None]
+
+    index = helpcenter_search.load_article_index(incremental=True, locale="en-us")
+    assert calls[1] is not None
+    assert index["1"]["title"] == "New" and index["2"]["title"] == "Kept" and "3" not in index
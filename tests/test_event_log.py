@@ -0,0 +1,20 @@
+from tools import event_log
+
+
+def test_failed_urls_skips_api_detours_and_catalog_calls(tmp_path):
+    log = event_log.EventLog(str(tmp_path / "scrape_log.jsonl"))
+    log.start_run("helpcenter_scrape")
+    ok = "https://support.ledger.com/article/1-zd"
+    broken = "https://support.ledger.com/article/2-zd"
+    # Article 1: API failed, HTML fallback succeeded.
+    log.log(ok, "api", 500, "api_http_error", detail="api=https://support.ledger.com/api/v2/help_center/articles/1.json")
+    log.log(ok, "api", None, "api_fallback")
+    # Article 2: both paths failed.
+    log.log(broken, "api", 500, "api_http_error")
+    log.log(broken, "fetch", 503, "http_error")
+    # A catalog request that is not tied to an article.
+    log.log("https://support.ledger.com/api/v2/help_center/en-us/sections.json", "api", 500, "api_http_error")
+    log.flush()
+
+    assert event_log.failed_urls(log.path) == [broken]
+    assert event_log.failed_urls(log.path, stages=None, reasons=["api_fallback"]) == [ok]
@@ -0,0 +1,44 @@
+"""A help center run journals only the articles it actually scraped, so
+``resume`` retries the ones whose fetch failed."""
+from types import SimpleNamespace
+
+import pytest
+
+from tools import article_store, checkpoint, event_log, helpcenter_search
+
+PAGE = "<html><body><h1>Title</h1><div id='article'><p>Body text.</p></div></body></html>"
+GOOD = "https://example.com/guides/good"
+BAD = "https://example.com/guides/bad"
+
+
+@pytest.fixture
+def run_dirs(monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(helpcenter_search, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(helpcenter_search, "ARTICLES_FILE", str(tmp_path / "articles.json"))
+    monkeypatch.setattr(helpcenter_search, "CSV_IMPORT_FILE", str(tmp_path / "missing.csv"))
+    monkeypatch.setattr(helpcenter_search, "LOG_FILE", str(tmp_path / "log.jsonl"))
+    monkeypatch.setattr(helpcenter_search, "EVENTS", event_log.EventLog(str(tmp_path / "log.jsonl")))
+    monkeypatch.setattr(helpcenter_search, "load_keywords", lambda: [])
+    store = article_store.ArticleStore(str(tmp_path / "articles.db"), canonicalize=helpcenter_search._normalize_url)
+    store.upsert_many([{"url": GOOD, "title": ""}, {"url": BAD, "title": ""}])
+    monkeypatch.setattr(helpcenter_search, "_store", store)
+
+    def fetch(url):
+        return None if url == BAD else SimpleNamespace(text=PAGE, from_cache=False, status_code=200)
+    monkeypatch.setattr(helpcenter_search, "_fetch_html", fetch)
+    return store
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_article_is_not_journalled(run_dirs, monkeypatch, workers):
+    recorded = []
+    original = checkpoint.Checkpoint.record
+    monkeypatch.setattr(checkpoint.Checkpoint, "record", lambda self, key, payload=None: (recorded.append(key), original(self, key, payload)))
+    monkeypatch.setattr(checkpoint.Checkpoint, "complete", lambda self: None)  # keep the journal to inspect
+
+    helpcenter_search.run_helpcenter_scrape(workers=workers, prefetch=False)
+
+    assert recorded == [GOOD]
+    assert run_dirs.get(GOOD)["title"] == "Title"
+    assert run_dirs.get(BAD)["title"] == ""
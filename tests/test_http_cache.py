@@ -0,0 +1,94 @@
+"""Conditional requests: validators are sent, 304s replay the cached body,
+and the cache is pruned by age and size."""
+import os
+import time
+
+import pytest
+import requests
+
+from tools import http_cache, http_client
+
+URL = "https://example.com/page"
+BODY = b"<html><head><title>Cached</title></head><body>hello</body></html>"
+
+
+def _response(status, body=b"", headers=None):
+    response = requests.models.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.url = URL
+    return response
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(http_cache, "ENABLED", True)
+    monkeypatch.setattr(http_cache, "_pruned", True)
+    state = {"etag": '"v1"', "requests": []}
+
+    def fake_get(url, headers=None, timeout=None, **kwargs):
+        headers = headers or {}
+        state["requests"].append(headers)
+        if headers.get("If-None-Match") == state["etag"]:
+            return _response(304)
+        return _response(200, BODY, {"Content-Type": "text/html", "ETag": state["etag"],
+                                     "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    monkeypatch.setattr(http_client, "get", fake_get)
+    return state
+
+
+def test_revalidation_replays_body_on_304(server):
+    first = http_cache.get(URL)
+    assert first.from_cache is False and first.content == BODY
+    assert "If-None-Match" not in server["requests"][0]
+
+    second = http_cache.get(URL + "?utm_source=x")  # same canonical URL
+    sent = server["requests"][1]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert second.status_code == 200 and second.from_cache is True
+    assert second.text == BODY.decode()
+
+
+def test_parsed_results_follow_the_cached_body(server):
+    http_cache.get(URL)
+    http_cache.store_parsed(URL, "metadata", {"title": "Cached"})
+    assert http_cache.load_parsed(URL, "metadata") == {"title": "Cached"}
+
+    server["etag"] = '"v2"'  # page changed: new body, parsed results dropped
+    response = http_cache.get(URL)
+    assert response.from_cache is False
+    assert http_cache.load_parsed(URL, "metadata") is None
+
+
+def test_missing_body_refetches_without_validators(server):
+    http_cache.get(URL)
+    os.remove(http_cache._paths(URL)[1])
+    response = http_cache.get(URL)
+    assert response.from_cache is False and response.content == BODY
+    assert "If-None-Match" not in server["requests"][-1]
+
+
+def test_responses_without_validators_are_not_stored(monkeypatch, server):
+    monkeypatch.setattr(http_client, "get", lambda url, **kw: _response(200, BODY, {"Content-Type": "text/html"}))
+    http_cache.get(URL)
+    assert http_cache.load_entry(URL) is None
+
+
+def test_prune_evicts_stale_then_least_recently_used(server):
+    for i in range(3):
+        http_cache.store(f"{URL}/{i}", _response(200, BODY, {"ETag": f'"{i}"'}))
+    old = time.time() - 40 * 24 * 3600
+    os.utime(http_cache._paths(f"{URL}/0")[0], (old, old))
+    recent = time.time() - 3600
+    os.utime(http_cache._paths(f"{URL}/1")[0], (recent, recent))
+
+    assert http_cache.prune(max_age_days=30, max_bytes=10 ** 9) == 1
+    assert http_cache.load_entry(f"{URL}/0") is None
+
+    entry_size = sum(os.path.getsize(p) for p in http_cache._paths(f"{URL}/2"))
+    assert http_cache.prune(max_age_days=30, max_bytes=entry_size) == 1
+    assert http_cache.load_entry(f"{URL}/1") is None  # least recently used goes first
+    assert http_cache.load_entry(f"{URL}/2") is not None
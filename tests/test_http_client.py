@@ -0,0 +1,43 @@
+"""Head-only fetches decode the streamed prefix with the page's declared charset."""
+import io
+
+import requests
+
+from tools import http_client
+
+HEAD = '<html><head><meta charset="{charset}"><title>Café – résumé</title></head><body>'
+
+
+def _install(monkeypatch, body, content_type):
+    def fake_request(method, url, headers=None, timeout=None, **kwargs):
+        response = requests.models.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = content_type
+        response.raw = io.BytesIO(body)
+        return response
+    monkeypatch.setattr(http_client, "request", fake_request)
+
+
+def test_meta_charset_is_used_without_header_charset(monkeypatch):
+    _install(monkeypatch, HEAD.format(charset="windows-1252").encode("cp1252") + b"x" * 10, "text/html")
+    response = http_client.get_head("https://example.com/")
+    assert response.encoding == "cp1252"
+    assert "Café – résumé" in response.text
+
+
+def test_http_equiv_charset_is_recognized():
+    content = b'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">'
+    assert http_client.sniff_charset(content) == "iso8859-1"
+
+
+def test_header_charset_wins_and_utf8_is_the_default(monkeypatch):
+    _install(monkeypatch, HEAD.format(charset="utf-8").encode("utf-8"), "text/html; charset=utf-8")
+    assert "résumé" in http_client.get_head("https://example.com/").text
+    assert http_client.sniff_charset(b"<head><title>x</title></head>") == "utf-8"
+    assert http_client.sniff_charset(b'<meta charset="no-such-codec">') == "utf-8"
+
+
+def test_head_stops_at_closing_head_tag(monkeypatch):
+    _install(monkeypatch, HEAD.format(charset="utf-8").encode("utf-8") + b"</head>" + b"y" * 100000, "text/html")
+    response = http_client.get_head("https://example.com/")
+    assert len(response.content) <= http_client.HEAD_CHUNK_SIZE  # first chunk only
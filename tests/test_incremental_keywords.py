@@ -0,0 +1,60 @@
+"""Incremental scrapes must recount keywords when the keyword list changes,
+even when the page itself comes back as a 304 from the HTTP cache."""
+from types import SimpleNamespace
+
+from tools import academy_search, helpcenter_search, keyword_matcher
+
+PAGE = """<html><body><h1>Storage</h1><div id="article">
+<p>Cold storage keeps keys offline. Self custody means you hold them.</p>
+</div></body></html>"""
+
+
+def _response(from_cache):
+    return SimpleNamespace(text=PAGE, from_cache=from_cache, status_code=200)
+
+
+def test_helpcenter_recounts_on_304_after_keyword_change(monkeypatch):
+    article = {"url": "https://example.com/guides/storage", "title": "Storage"}
+
+    monkeypatch.setattr(helpcenter_search, "_fetch_html", lambda url: _response(False))
+    first = helpcenter_search.ScrapeContext(keywords=["cold storage"], incremental=True)
+    article = helpcenter_search.scrape_article(article, first)
+    assert article["keywords"] == {"cold storage": 1}
+
+    monkeypatch.setattr(helpcenter_search, "_fetch_html", lambda url: _response(True))
+    second = helpcenter_search.ScrapeContext(keywords=["self custody"], incremental=True)
+    article = helpcenter_search.scrape_article(article, second)
+    assert article["keywords"] == {"self custody": 1}
+
+
+def test_helpcenter_reuses_304_with_same_keywords(monkeypatch):
+    article = {"url": "https://example.com/guides/storage", "title": "Storage"}
+    context = helpcenter_search.ScrapeContext(keywords=["cold storage"], incremental=True)
+
+    monkeypatch.setattr(helpcenter_search, "_fetch_html", lambda url: _response(False))
+    article = helpcenter_search.scrape_article(article, context)
+    article["keywords"] = {"cold storage": 42}  # marker: must survive a 304
+
+    monkeypatch.setattr(helpcenter_search, "_fetch_html", lambda url: _response(True))
+    article = helpcenter_search.scrape_article(article, context)
+    assert article["keywords"] == {"cold storage": 42}
+
+
+def _use_academy_keywords(monkeypatch, keywords):
+    monkeypatch.setattr(academy_search, "KEYWORDS", keywords)
+    monkeypatch.setattr(academy_search, "KEYWORD_MATCHER", keyword_matcher.KeywordMatcher(keywords))
+
+
+def test_academy_recounts_on_304_after_keyword_change(monkeypatch):
+    monkeypatch.setattr(academy_search, "check_translations", lambda url, soup: {})
+    article = {"link": "https://www.ledger.com/academy/storage", "title": "Storage"}
+
+    _use_academy_keywords(monkeypatch, ["cold storage"])
+    monkeypatch.setattr(academy_search, "_fetch_html", lambda url: _response(False))
+    article = academy_search.scrape_article(article, incremental=True)
+    assert article["Keywords"] == {"cold storage": 1}
+
+    _use_academy_keywords(monkeypatch, ["self custody"])
+    monkeypatch.setattr(academy_search, "_fetch_html", lambda url: _response(True))
+    article = academy_search.scrape_article(article, incremental=True)
+    assert article["Keywords"] == {"self custody": 1}
@@ -0,0 +1,57 @@
+"""KeywordMatcher must give the same answers as the per-keyword loops it
+replaces, on both the per-pattern scan and the automaton path."""
+import re
+
+import pytest
+
+from tools import keyword_matcher
+
+TEXT = ("Ledger Live shows your Ledger balance. ledger live is open; LEDGER Live too. "
+        "A hackathon is not a hack, but hack_tool and hack-day are. aaaa banana nana")
+KEYWORDS = ["Ledger", "Ledger Live", "ledger live", "hack", "aa", "ana", "nana", "missing", ""]
+
+
+@pytest.fixture(params=["scan", "automaton"])
+def path(request, monkeypatch):
+    if request.param == "automaton":
+        monkeypatch.setattr(keyword_matcher, "SCAN_THRESHOLD", 0)
+    return request.param
+
+
+def _expected(keywords, text, case_fold, word_boundary):
+    result = {}
+    for kw in dict.fromkeys(keywords):
+        pattern, haystack = (kw.lower(), text.lower()) if case_fold else (kw, text)
+        if not pattern:
+            result[kw] = 0
+        elif word_boundary:
+            result[kw] = len(re.findall(r"(?<!\w)" + re.escape(pattern) + r"(?!\w)", haystack))
+        else:
+            result[kw] = haystack.count(pattern)
+    return result
+
+
+@pytest.mark.parametrize("case_fold", [True, False])
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_counts_match_str_count(path, case_fold, word_boundary):
+    matcher = keyword_matcher.KeywordMatcher(KEYWORDS, word_boundary=word_boundary, case_fold=case_fold)
+    assert matcher._use_automaton == (path == "automaton")
+    expected = _expected(KEYWORDS, TEXT, case_fold, word_boundary)
+    assert matcher.count(TEXT) == expected
+    assert matcher.found(TEXT) == {kw for kw, n in expected.items() if n}
+
+
+def test_word_boundary_skips_partial_words(path):
+    matcher = keyword_matcher.KeywordMatcher(["hack"], word_boundary=True)
+    assert matcher.count("hackathon hack hack_tool hack-day") == {"hack": 2}
+
+
+def test_case_fold_off_is_case_sensitive(path):
+    matcher = keyword_matcher.KeywordMatcher(["Ledger"], case_fold=False)
+    assert matcher.count("Ledger ledger LEDGER") == {"Ledger": 1}
+    assert matcher.first("ledger") is None
+
+
+def test_first_follows_keyword_order(path):
+    matcher = keyword_matcher.KeywordMatcher(["wallet", "ledger"])
+    assert matcher.first("my ledger wallet") == "wallet"
@@ -0,0 +1,76 @@
+"""Token bucket spacing, pauses after a 429 and the AIMD concurrency limit."""
+from types import SimpleNamespace
+
+import pytest
+
+from tools import rate_limit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    fake = SimpleNamespace(monotonic=lambda: now["t"], time=lambda: now["t"], sleep=lambda s: None)
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return now
+
+
+def test_reserve_spaces_callers_at_rate(clock):
+    bucket = rate_limit.TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits == pytest.approx([0.0, 0.0, 0.1, 0.2, 0.3])
+
+
+def test_reserve_refills_over_time(clock):
+    bucket = rate_limit.TokenBucket(rate=10, burst=1)
+    assert bucket.reserve() == 0.0
+    clock["t"] += 0.1
+    assert bucket.reserve() == pytest.approx(0.0)
+
+
+def test_pause_keeps_waiters_spaced(clock):
+    bucket = rate_limit.TokenBucket(rate=10, burst=5)
+    bucket.pause(30)
+    waits = [bucket.reserve() for _ in range(12)]
+    assert waits == pytest.approx([30 + 0.1 * (i + 1) for i in range(12)])
+
+
+def test_pause_does_not_shorten_an_earlier_pause(clock):
+    bucket = rate_limit.TokenBucket(rate=10, burst=1)
+    bucket.pause(30)
+    bucket.pause(5)
+    assert bucket.reserve() == pytest.approx(30.1)
+
+
+def test_release_with_retry_after_pauses_and_halves(clock):
+    lim = rate_limit.Limiter("test", rate=10, burst=1, max_concurrency=8)
+    lim.acquire()
+    lim.release(429, retry_after=5)
+    assert lim.concurrency.limit == 4
+    assert lim.bucket.reserve() == pytest.approx(5.1)
+
+
+def test_release_without_retry_after_backs_off_exponentially(clock):
+    lim = rate_limit.Limiter("test", rate=10, burst=1, max_concurrency=8)
+    lim.release(429)
+    lim.release(429)
+    assert lim.bucket.reserve() == pytest.approx(4.1)  # 2 ** 2 strikes
+
+
+def test_aimd_additive_increase_multiplicative_decrease():
+    aimd = rate_limit.AdaptiveConcurrency(8)
+    aimd.release(throttled=True)
+    aimd.release(throttled=True)
+    assert aimd.limit == 2
+    for _ in range(2):
+        aimd.release()
+    assert aimd.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)  # +1/limit per success
+    for _ in range(100):
+        aimd.release()
+    assert aimd.limit == 8
+
+
+def test_aimd_never_drops_below_minimum():
+    aimd = rate_limit.AdaptiveConcurrency(2)
+    for _ in range(5):
+        aimd.release(throttled=True)
+    assert aimd.limit == 1
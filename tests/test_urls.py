@@ -0,0 +1,19 @@
+"""Canonical URL spelling and the registry's stable IDs."""
+from tools import urls
+
+
+def test_canonicalize_drops_noise():
+    assert urls.canonicalize(" HTTPS://WWW.Example.com:443/a/?utm_source=x&b=2&a=1#top ") == "https://www.example.com/a/?a=1&b=2"
+    assert urls.canonicalize("example.com") == "https://example.com/"
+    assert urls.canonicalize("https://a.comhttps://a.com/x") == "https://a.com/x"
+    assert urls.canonicalize("/relative/path") == "/relative/path"
+
+
+def test_registry_ids_are_stable_across_spellings():
+    registry = urls.UrlRegistry()
+    assert registry.add("https://example.com/a?gclid=1")
+    assert not registry.add("HTTPS://EXAMPLE.COM/a")
+    assert len(registry) == 1
+    assert "example.com/a" in registry
+    assert registry.id_for("https://example.com/a#x") == urls.url_id("https://example.com/a")
+    assert registry.id_for("https://example.com/b") is None
@@ -0,0 +1,80 @@
+"""Zendesk listings are paged through ``next_page`` and always terminate,
+including on the incremental endpoint, which keeps offering a next page."""
+from tools import helpcenter_search, host_health, http_cache, http_client
+
+HOST = "https://support.ledger.com"
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.requested.append(url)
+        assert len(self.requested) < 20, "pagination did not stop"
+        return FakeResponse(self.pages[url])
+
+
+def _install(monkeypatch, pages):
+    session = FakeSession(pages)
+    monkeypatch.setattr(http_cache, "ENABLED", False)
+    monkeypatch.setattr(http_client, "get", session.get)
+    monkeypatch.setattr(helpcenter_search, "ZD_HEALTH", host_health.HostHealth(helpcenter_search.ZD_HOSTS))
+    return session
+
+
+def test_bulk_listing_follows_next_page(monkeypatch):
+    first = f"{HOST}/api/v2/help_center/en-us/articles.json?per_page={helpcenter_search.ZD_PAGE_SIZE}&sort_by=position"
+    second = f"{HOST}/api/v2/help_center/en-us/articles.json?page=2"
+    session = _install(monkeypatch, {
+        first: {"articles": [{"id": 1}, {"id": 2}], "next_page": second},
+        second: {"articles": [{"id": 3}], "next_page": None},
+    })
+    index = helpcenter_search.prefetch_articles(locale="en-us")
+    assert sorted(index) == ["1", "2", "3"]
+    assert session.requested == [first, second]
+
+
+def test_incremental_listing_stops_at_end_of_stream(monkeypatch):
+    first = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=100"
+    second = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=200"
+    session = _install(monkeypatch, {
+        first: {"articles": [{"id": 1}], "next_page": second, "end_of_stream": False},
+        second: {"articles": [{"id": 2}], "next_page": second, "end_of_stream": True},
+    })
+    index = helpcenter_search.prefetch_articles(since=100)
+    assert sorted(index) == ["1", "2"]
+    assert session.requested == [first, second]
+
+
+def test_incremental_listing_stops_when_next_page_repeats(monkeypatch):
+    first = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=100"
+    session = _install(monkeypatch, {
+        first: {"articles": [{"id": 1}], "next_page": first},
+    })
+    assert sorted(helpcenter_search.prefetch_articles(since=100)) == ["1"]
+    assert session.requested == [first]
+
+
+def test_incremental_listing_stops_on_empty_page(monkeypatch):
+    first = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=100"
+    second = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=300"
+    third = f"{HOST}/api/v2/help_center/incremental/articles.json?start_time=301"
+    session = _install(monkeypatch, {
+        first: {"articles": [{"id": 1}], "next_page": second},
+        second: {"articles": [], "next_page": third},
+    })
+    assert sorted(helpcenter_search.prefetch_articles(since=100)) == ["1"]
+    assert session.requested == [first, second]
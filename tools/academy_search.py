@@ -1,11 +1,11 @@
 import os
 import csv
-import json
 import time
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from random import uniform
+from urllib.parse import urlsplit
+
+from . import article_store, checkpoint, event_log, http_client, http_cache, html_parser, keyword_matcher, sitemap, storage, urls
 
 # =======================
 # FILE PATHS
@@ -15,8 +15,17 @@ OUTPUT_DIR = "output"
 INPUT_DIR = "input"
 
 CSV_IMPORT_FILE = os.path.join(INPUT_DIR, "academy_articles_import.csv")
-ARTICLES_FILE = os.path.join(DATA_DIR, "academy_articles.json")
-LOG_FILE = os.path.join(OUTPUT_DIR, "academy_scrape_log.txt")
+ARTICLES_FILE = os.path.join(DATA_DIR, "academy_articles.json")  # JSON export; imported into an empty store
+STORE_FILE = os.path.join(DATA_DIR, "academy_articles.db")
+LOG_FILE = os.path.join(OUTPUT_DIR, "academy_scrape_log.jsonl")
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+SITEMAP_URL = getattr(config, "ACADEMY_SITEMAP_URL", "https://www.ledger.com/sitemap_index.xml")
+ACADEMY_PATH = "/academy/"
 
 # Ensure necessary directories exist
 for directory in [DATA_DIR, OUTPUT_DIR, INPUT_DIR]:
@@ -27,67 +36,138 @@ for directory in [DATA_DIR, OUTPUT_DIR, INPUT_DIR]:
 # KEYWORDS TO SEARCH
 # =======================
 KEYWORDS = ["Device", "Hardware Wallet", "Cold Storage Wallet", "Ledger Live", "Bolos OS", "Partner", "Provider", "swap provider", "swap partner", "Crypto Wallet", "Ledger Wallet"]
+KEYWORD_MATCHER = keyword_matcher.KeywordMatcher(KEYWORDS)
+
+# =======================
+# TRANSLATIONS
+# =======================
+LANGUAGES = {
+    "Arabic (ar)": "ar",
+    "Chinese Simplified (zh-hans)": "zh-hans",
+    "French (fr)": "fr",
+    "German (de)": "de",
+    "Russian (ru)": "ru",
+    "Spanish (es)": "es",
+    "Portuguese (pt-br)": "pt-br",
+    "Turkish (tr)": "tr",
+    "Japanese (ja)": "ja",
+    "Korean (ko)": "ko",
+}
+PROBE_UNDECLARED = True   # HEAD-probe locales the page's hreflang links don't list
+TRANSLATION_WORKERS = 5   # concurrent HEAD probes per article
 
 # =======================
 # SMART RATE LIMITING
 # =======================
-def fetch_page(url, retries=3):
-    session = requests.Session()
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/114.0.0.0 Safari/537.36"
-        )
-    }
-    for attempt in range(retries):
+def _fetch_html(url, retries=3):
+    """Return the 200 response for ``url`` (possibly replayed from cache) or ``None``."""
+    status, reason, detail, latency = None, "fetch_failed", None, None
+    for attempt in range(1, retries + 1):
+        started = time.monotonic()
         try:
             print(f"🌐 Fetching: {url}")
-            response = session.get(url, headers=headers, timeout=10)
+            response = http_cache.get(url, headers=http_client.HTML_HEADERS, timeout=10)
+            status, latency = response.status_code, time.monotonic() - started
             if response.status_code == 200:
-                return BeautifulSoup(response.text, "html.parser")
+                return response
             elif response.status_code == 429:
-                wait_time = 2 ** attempt + uniform(1, 3)
-                print(f"⚠️ Rate limited. Retrying in {wait_time:.2f} seconds...")
-                time.sleep(wait_time)
+                # The host limiter has already paused for Retry-After / backoff.
+                print("⚠️ Rate limited. Retrying once the host budget allows...")
+                reason = "rate_limited"
+            else:
+                reason = "http_error"
         except Exception as e:
             print(f"❌ Error fetching {url}: {e}")
+            status, reason, detail, latency = "exception", "exception", e, time.monotonic() - started
     print(f"❌ Failed to retrieve page after {retries} attempts.")
-    log_failure(url, "Failed to fetch page")
+    log_failure(url, reason, "fetch", status, latency, retries, detail)
     return None
 
+def fetch_page(url, retries=3):
+    response = _fetch_html(url, retries)
+    return html_parser.make_soup(response.text) if response is not None else None
+
+# =======================
+# TRANSLATION DETECTION
+# =======================
+def translated_url(url, code):
+    return url.replace("/academy/", f"/{code}/academy/", 1)
+
+def declared_translations(soup):
+    """ Return the lowercased hreflang codes of the page's alternate links. """
+    declared = set()
+    for link in soup.find_all("link", hreflang=True):
+        rel = link.get("rel") or []
+        if "alternate" in (rel if isinstance(rel, list) else rel.split()):
+            declared.add(link["hreflang"].strip().lower())
+    return declared
+
+def _is_declared(code, declared):
+    # "fr" also matches a regional "fr-fr"; "pt-br" needs its exact region.
+    return code in declared or any(d.split("-")[0] == code for d in declared)
+
+def _probe_translation(url):
+    """ HEAD-only check; a redirect away from the locale path means no translation. """
+    try:
+        resp = http_client.head(url, headers=http_client.HTML_HEADERS, timeout=10)
+    except Exception as e:
+        print(f"❌ Error checking translation for {url}: {e}")
+        return False
+    code = url.split("/academy/")[0].rsplit("/", 1)[-1]
+    return resp.status_code == 200 and f"/{code}/academy/" in (resp.url or url)
+
+def check_translations(url, soup, probe=PROBE_UNDECLARED):
+    """ Map each language to "Y"/"N" using the English page already fetched.
+
+    Locales declared in ``<link rel="alternate" hreflang>`` need no request;
+    the rest are HEAD-probed concurrently when ``probe`` is set.
+    """
+    declared = declared_translations(soup)
+    results = {lang: "Y" if _is_declared(code, declared) else "N" for lang, code in LANGUAGES.items()}
+    missing = [lang for lang, found in results.items() if found == "N"]
+    if probe and missing and "/academy/" in url:
+        with ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS) as pool:
+            targets = [translated_url(url, LANGUAGES[lang]) for lang in missing]
+            for lang, exists in zip(missing, pool.map(_probe_translation, targets)):
+                results[lang] = "Y" if exists else "N"
+    return results
+
 # =======================
 # LOGGING FUNCTION
 # =======================
-def log_failure(url, reason):
-    """ Log failures to an output file for future inspection. """
-    with open(LOG_FILE, "a") as f:
-        f.write(f"{datetime.now()} - {url} - {reason}\n")
+EVENTS = event_log.EventLog(LOG_FILE)
+
+def log_failure(url, reason, stage="scrape", status=None, latency=None, attempt=None, detail=None):
+    """ Queue a failure event; the event log flushes it to disk in the background. """
+    EVENTS.log(url, stage, status, reason, latency=latency, attempt=attempt, detail=detail)
 
 # =======================
-# OFFLINE SYNC: CSV → JSON
+# OFFLINE SYNC: CSV → STORE
 # =======================
+_store = None
+
+def get_store():
+    """ Return the academy article store, importing academy_articles.json on first use. """
+    global _store
+    if _store is None:
+        _store = article_store.ArticleStore(STORE_FILE, key_field="link", canonicalize=urls.canonicalize, legacy_json=ARTICLES_FILE)
+    return _store
+
 def load_and_sync_articles():
-    """ Load academy_articles.json and merge with CSV data if available. """
+    """ Merge academy_articles_import.csv (if available) into the article store. """
     print("🔍 Loading existing academy articles...")
-    
-    # Load JSON data
-    existing_articles = []
-    if os.path.exists(ARTICLES_FILE):
-        with open(ARTICLES_FILE, "r") as f:
-            existing_articles = json.load(f)
-
-    existing_links = {article.get("link") for article in existing_articles}
+    store = get_store()
     
     # Load CSV data if it exists
     if os.path.exists(CSV_IMPORT_FILE):
         print("📥 Merging data from academy_articles_import.csv...")
+        new_articles = []
         with open(CSV_IMPORT_FILE, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
-                link = row.get("Link", "").strip()
-                if link and link not in existing_links:
-                    new_article = {
+                link = urls.canonicalize(row.get("Link", ""))
+                if link and link not in store:
+                    new_articles.append({
                         "link": link,
                         "title": row.get("Article", "Unknown Title").strip(),
                         "category": row.get("Category", "Unknown Category").strip(),
@@ -96,34 +176,96 @@ def load_and_sync_articles():
                         "type": row.get("Type", "Unknown Type").strip(),
                         "translations": {},
                         "Keywords": {}
-                    }
-                    existing_articles.append(new_article)
-                    existing_links.add(link)
-    
-    # Save back to JSON
-    with open(ARTICLES_FILE, "w") as f:
-        json.dump(existing_articles, f, indent=4)
+                    })
+        added = store.upsert_many(new_articles)
+        print(f"✅ Merged {added} new article(s) into {STORE_FILE}")
     
-    print(f"✅ Merged articles saved to {ARTICLES_FILE}")
-    return existing_articles
+    return store
+
+# =======================
+# SITEMAP DISCOVERY
+# =======================
+def _is_academy_article(url):
+    """ English academy article pages only (localized copies live under /<code>/academy/). """
+    path = urlsplit(url).path
+    return path.startswith(ACADEMY_PATH) and len(path.strip("/")) > len(ACADEMY_PATH.strip("/"))
+
+def discover_from_sitemap(index_url=SITEMAP_URL):
+    """ Stream the sitemap and return ``{link: lastmod}`` for new or modified articles.
+
+    Links are canonical (``urls.canonicalize``), the same keys the store
+    and the scan use. New URLs are added to the store. An article counts as modified when its
+    sitemap ``lastmod`` differs from the one recorded at its last successful
+    scan (``sitemap_lastmod``); entries without a lastmod are always returned.
+    """
+    print(f"🗺️ Reading academy URLs from {index_url}...")
+    store = get_store()
+    changed, new_articles, seen = {}, [], 0
+    for loc, lastmod in sitemap.iter_urls(index_url):
+        if not _is_academy_article(loc):
+            continue
+        url = urls.canonicalize(loc)
+        if url in changed:
+            continue
+        seen += 1
+        existing = store.get(url)
+        if existing is None:
+            new_articles.append({
+                "link": url,
+                "title": "Unknown Title",
+                "category": "Unknown Category",
+                "publish_date": "Unknown Date",
+                "update_date": (lastmod or "Unknown Date")[:10],
+                "type": "Unknown Type",
+                "translations": {},
+                "Keywords": {}
+            })
+            changed[url] = lastmod
+        elif not lastmod or existing.get("sitemap_lastmod") != lastmod:
+            changed[url] = lastmod
+    added = store.upsert_many(new_articles)
+    print(f"✅ {seen} academy URL(s) in sitemap: {added} new, {len(changed) - added} modified.")
+    return changed
 
 # =======================
 # SCRAPE AND UPDATE ARTICLE
 # =======================
-def scrape_article(article):
-    """ Scrapes the page for keywords and updates the article details. """
+def scrape_article(article, incremental=False):
+    """ Scrapes the page for keywords and updates the article details.
+
+    A fingerprint of the normalized page text, keyword list and declared
+    hreflang locales is stored on the article. With ``incremental`` an
+    unchanged page (a 304 for a page scanned with the same keywords, or the
+    same fingerprint) keeps its previous description, keyword counts and
+    translations.
+    """
     url = article["link"]
-    soup = fetch_page(url)
-    if not soup:
+    response = _fetch_html(url)
+    if response is None:
+        # _fetch_html has already logged the failure.
         print(f"❌ Failed to scrape article: {url}")
-        log_failure(url, "Scrape failed (no soup object)")
         return None
 
+    # A 304 is only reusable if the stored counts are for the same keywords.
+    keywords_fp = storage.fingerprint(KEYWORDS)
+    if incremental and response.from_cache and article.get("keywords_fingerprint") == keywords_fp:
+        print(f"⏭️ Unchanged since last scan: {url}")
+        return article
+
+    soup = html_parser.make_soup(response.text)
+    text = soup.get_text()
+    fp = storage.fingerprint(storage.normalize_text(text), KEYWORDS, sorted(declared_translations(soup)))
+    if incremental and article.get("fingerprint") == fp:
+        print(f"⏭️ Unchanged since last scan: {url}")
+        return article
+    article["fingerprint"] = fp
+    article["keywords_fingerprint"] = keywords_fp
+
     # Title extraction if not present
     if not article.get("title") or article["title"] == "Unknown Title":
         article["title"] = soup.find("h1").text.strip() if soup.find("h1") else "Unknown Title"
         if article["title"] == "Unknown Title":
-            log_failure(url, "Title not found on page")
+            log_failure(url, "no_title", "extract")
 
     # Description (first 3 paragraphs)
     description = ""
@@ -135,58 +277,108 @@ def scrape_article(article):
     article["description"] = description
     
     # Keyword counting
-    text = soup.get_text().lower()
-    article["Keywords"] = {keyword: text.count(keyword.lower()) for keyword in KEYWORDS}
+    article["Keywords"] = KEYWORD_MATCHER.count(text)
+
+    # Translation coverage (hreflang first, HEAD probes for the rest)
+    article["translations"] = check_translations(url, soup)
     return article
 
 # =======================
 # SAVE RESULTS TO CSV (Including URL)
 # =======================
-def save_to_csv(articles):
-    """Export the article data to a CSV file, including URL."""
+def _csv_row(article):
+    row = {
+        "URL": article.get("link", ""),
+        "Title": article.get("title", ""),
+        "Description": article.get("description", ""),
+        "Publish Date": article.get("publish_date", ""),
+        "Last Edit": article.get("update_date", ""),
+        "Category": article.get("category", ""),
+        "Type": article.get("type", "")
+    }
+    for keyword in KEYWORDS:
+        row[keyword] = article.get("Keywords", {}).get(keyword, 0)
+    translations = article.get("translations") or {}
+    for lang in LANGUAGES:
+        row[lang] = translations.get(lang, "N")
+    return row
+
+def save_to_csv(articles=None):
+    """Export the article data to a CSV file, including URL.
+
+    Without ``articles`` the rows are streamed straight from the store.
+    """
     date_str = datetime.now().strftime("%m%d%y")
     filename = os.path.join(OUTPUT_DIR, f"ledger_academy_articles_{date_str}.csv")
     
-    headers = ["URL", "Title", "Description", "Publish Date", "Last Edit", "Category", "Type"] + KEYWORDS
+    headers = ["URL", "Title", "Description", "Publish Date", "Last Edit", "Category", "Type"] + KEYWORDS + list(LANGUAGES)
     
-    with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for article in articles:
-            row = {
-                "URL": article.get("link", ""),
-                "Title": article.get("title", ""),
-                "Description": article.get("description", ""),
-                "Publish Date": article.get("publish_date", ""),
-                "Last Edit": article.get("update_date", ""),
-                "Category": article.get("category", ""),
-                "Type": article.get("type", "")
-            }
-            for keyword in KEYWORDS:
-                row[keyword] = article["Keywords"].get(keyword, 0)
-            writer.writerow(row)
+    if articles is None:
+        get_store().export_csv(filename, headers, _csv_row)
+    else:
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            for article in articles:
+                writer.writerow(_csv_row(article))
 
     print(f"✅ Data saved to {filename}")
 
+def save_to_json():
+    """ Write every stored article to ARTICLES_FILE as a JSON array. """
+    count = get_store().export_json(ARTICLES_FILE)
+    print(f"✅ {count} article(s) saved to {ARTICLES_FILE}")
+
 # =======================
 # MAIN FUNCTION
 # =======================
-def run_academy_keyword_scan():
+def run_academy_keyword_scan(incremental=False, resume=False, only_urls=None, use_sitemap=False):
+    """Sync, scrape and export academy articles.
+
+    Each article is written back to the store and journalled as soon as it
+    is scraped; ``resume`` continues an interrupted scan after the last
+    completed article. With ``incremental`` only new or changed pages are
+    re-extracted. ``only_urls`` limits the scan to those articles (e.g. the
+    ``event_log.failed_urls`` of the previous scan). With ``use_sitemap``
+    articles are discovered from the sitemap and only new or modified ones
+    are scanned.
+    """
     print("🚀 Starting Academy Scraper & Keyword Scan...")
     
     # **1️⃣ Offline Sync**
-    articles = load_and_sync_articles()
+    store = load_and_sync_articles()
+    lastmods = {}
+    if use_sitemap:
+        lastmods = discover_from_sitemap()
+        wanted = {urls.canonicalize(u) for u in only_urls} if only_urls is not None else None
+        only_urls = [u for u in lastmods if wanted is None or u in wanted]
+    total = len(store)
+    only = {urls.canonicalize(u) for u in only_urls} if only_urls is not None else None
+    if only is not None:
+        print(f"🔁 Re-queued {len(only)} article(s).")
+    EVENTS.start_run("academy_scan")
     
     # **2️⃣ Web Scrape**
-    for idx, article in enumerate(articles):
-        print(f"🔎 Scraping Article {idx + 1}/{len(articles)}")
-        updated_article = scrape_article(article)
-        if updated_article:
-            articles[idx] = updated_article
+    journal = checkpoint.Checkpoint("academy_scan", resume=resume)
+    with journal:
+        for idx, article in enumerate(store.iter_articles()):
+            if journal.is_done(article["link"]):
+                continue
+            if only is not None and article["link"] not in only:
+                continue
+            print(f"🔎 Scraping Article {idx + 1}/{total}")
+            updated_article = scrape_article(article, incremental)
+            if updated_article:
+                if lastmods.get(article["link"]):
+                    updated_article["sitemap_lastmod"] = lastmods[article["link"]]
+                store.upsert(updated_article)
+                journal.record(article["link"])  # failures are retried on resume
 
     # **3️⃣ Save Results**
-    save_to_csv(articles)
-    with open(ARTICLES_FILE, "w") as f:
-        json.dump(articles, f, indent=4)
+    save_to_csv()
+    save_to_json()
+    journal.complete()
+    EVENTS.flush()
+    event_log.print_summary(LOG_FILE)
 
-    print("✅ Scan, Update, and Save complete.")
\ No newline at end of file
+    print("✅ Scan, Update, and Save complete.")
@@ -6,6 +6,8 @@ import time
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+from . import urls
+
 # =======================
 # CONFIGURATION
 # =======================
@@ -60,10 +62,7 @@ def save_json(data, filepath):
         json.dump(data, f, indent=4)
 
 def clean_url(url):
-    url = url.strip()
-    if url.startswith("https://www.ledger.comhttps://"):
-        url = url.replace("https://www.ledger.comhttps://", "https://www.ledger.com/")
-    return url
+    return urls.canonicalize(url)
 
 def get_soup(url):
     url = clean_url(url)
@@ -124,7 +123,8 @@ def discover_articles():
     if not soup:
         print("❌ Failed to retrieve Academy page.")
         return []
-    articles_set = set()
+    registry = urls.UrlRegistry()
+    discovered = []
     for link in soup.find_all("a", href=True):
         href = link["href"].strip()
         if "/academy/topics/" in href:
@@ -133,9 +133,10 @@ def discover_articles():
             else:
                 full_url = f"https://www.ledger.com{href}"
             full_url = clean_url(full_url)
-            articles_set.add(full_url)
-    # Preserve order
-    return list(dict.fromkeys(articles_set))
+            # Preserve page order
+            if registry.add(full_url):
+                discovered.append(full_url)
+    return discovered
 
 def check_translation_exists(url):
     """
@@ -260,6 +261,7 @@ def run_academy_scraper():
             articles_list = articles
         else:
             articles_list = [{"link": url} for url in articles]
+    known = urls.UrlRegistry(a.get("link") for a in articles_list)
     
     if choice == "1":
         if not articles_list:
@@ -271,10 +273,7 @@ def run_academy_scraper():
 
     elif choice == "2":
         discovered = discover_articles()
-        new_articles = []
-        for url in discovered:
-            if not any(a.get("link") == url for a in articles_list):
-                new_articles.append({"link": url})
+        new_articles = [{"link": url} for url in discovered if url not in known]
         num_input = input("How many new articles? (Enter a number or 'all'): ").strip().lower()
         if num_input != "all":
             try:
@@ -286,10 +285,7 @@ def run_academy_scraper():
 
     elif choice == "3":
         discovered = discover_articles()
-        new_articles = []
-        for url in discovered:
-            if not any(a.get("link") == url for a in articles_list):
-                new_articles.append({"link": url})
+        new_articles = [{"link": url} for url in discovered if url not in known]
         num_input = input("How many additional new articles? (Enter a number or 'all'): ").strip().lower()
         if num_input != "all":
             try:
@@ -300,10 +296,10 @@ def run_academy_scraper():
         articles_list.extend(new_articles)
 
     elif choice == "4":
-        urls = input("Enter article URLs (comma-separated): ").strip().split(",")
-        new_urls = [clean_url(url) for url in urls if url.strip()]
+        entered = input("Enter article URLs (comma-separated): ").strip().split(",")
+        new_urls = [clean_url(url) for url in entered if url.strip()]
         for url in new_urls:
-            if not any(a.get("link") == url for a in articles_list):
+            if known.add(url):
                 articles_list.append({"link": url})
 
     elif choice == "5":
@@ -319,12 +315,7 @@ def run_academy_scraper():
         total_imported = len(imported_articles)
         new_records = 0
         for art in imported_articles:
-            exists = False
-            for existing in articles_list:
-                if existing.get("link") == art.get("link"):
-                    exists = True
-                    break
-            if not exists:
+            if known.add(art.get("link")):
                 articles_list.append(art)
                 new_records += 1
         save_json(articles_list, ARTICLES_FILE)
@@ -338,11 +329,9 @@ def run_academy_scraper():
     # If not using import-only, continue with scraping process:
     # Remove duplicates (based on the link)
     unique_articles = []
-    seen = set()
+    seen = urls.UrlRegistry()
     for art in articles_list:
-        link = art.get("link")
-        if link and link not in seen:
-            seen.add(link)
+        if seen.add(art.get("link")):
             unique_articles.append(art)
     articles_list = unique_articles
     save_json(articles_list, ARTICLES_FILE)
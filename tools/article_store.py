@@ -0,0 +1,154 @@
+"""Embedded SQLite store for scraped articles.
+
+Each article is one row keyed by its canonical URL, so a scrape updates
+only the articles it touched instead of rewriting a whole JSON file.
+Rows keep the order in which they were first added (``position``), and
+reads and exports stream row by row, so memory use does not grow with
+the size of the corpus.
+
+A ``*.json`` article list (the format ``export_json`` writes) is imported
+when the store is opened empty, e.g. the first time or after the database
+was deleted.
+"""
+import csv
+import json
+import os
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url      TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_position ON articles (position);
+"""
+
+
+class ArticleStore:
+    """Article rows keyed by ``key_field`` (the article's canonical URL).
+
+    ``canonicalize`` maps a raw URL to its key and is applied on every
+    upsert and lookup, so the same article is never stored twice. One
+    connection is shared by every thread and guarded by a lock, so
+    scraper workers can call ``upsert`` as each article finishes.
+    """
+
+    def __init__(self, path, key_field="url", canonicalize=None, legacy_json=None):
+        self.path = path
+        self.key_field = key_field
+        self.canonicalize = canonicalize or (lambda url: (url or "").strip())
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM articles").fetchone()
+        self._next_position = row[0] + 1
+        if legacy_json and self._next_position == 0 and os.path.exists(legacy_json):
+            self._migrate(legacy_json)
+
+    def _migrate(self, legacy_json):
+        with open(legacy_json, "r", encoding="utf-8") as f:
+            articles = json.load(f)
+        added = self.upsert_many(articles)
+        print(f"📦 Imported {added} article(s) from {legacy_json} into {self.path}")
+
+    # =======================
+    # WRITES
+    # =======================
+    def _upsert(self, article):
+        key = self.canonicalize(article.get(self.key_field))
+        if not key:
+            return False
+        article[self.key_field] = key
+        data = json.dumps(article, ensure_ascii=False)
+        cur = self._conn.execute("UPDATE articles SET data = ? WHERE url = ?", (data, key))
+        if cur.rowcount:
+            return False
+        self._conn.execute(
+            "INSERT INTO articles (url, position, data) VALUES (?, ?, ?)",
+            (key, self._next_position, data),
+        )
+        self._next_position += 1
+        return True
+
+    def upsert(self, article):
+        """Insert or replace one article; returns ``True`` when it was new."""
+        with self._lock, self._conn:
+            return self._upsert(article)
+
+    def upsert_many(self, articles):
+        """Upsert ``articles`` in one transaction; returns how many were new."""
+        added = 0
+        with self._lock, self._conn:
+            for article in articles:
+                added += self._upsert(article)
+        return added
+
+    # =======================
+    # READS
+    # =======================
+    def get(self, key):
+        key = self.canonicalize(key)
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM articles WHERE url = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __contains__(self, key):
+        key = self.canonicalize(key)
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM articles WHERE url = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def iter_articles(self, batch_size=500):
+        """Yield every article in insertion order, ``batch_size`` rows at a time."""
+        last = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT position, data FROM articles WHERE position > ? ORDER BY position LIMIT ?",
+                    (last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for position, data in rows:
+                yield json.loads(data)
+            last = rows[-1][0]
+
+    # =======================
+    # EXPORTS
+    # =======================
+    def export_csv(self, path, headers, to_row):
+        """Stream every article through ``to_row`` into a CSV at ``path``."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            for article in self.iter_articles():
+                writer.writerow(to_row(article))
+                count += 1
+        return count
+
+    def export_json(self, path):
+        """Stream every article into a JSON array at ``path``."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for article in self.iter_articles():
+                f.write(",\n  " if count else "\n  ")
+                f.write(json.dumps(article, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n" if count else "]\n")
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,110 @@
+"""Checkpoint journals for resumable scraping runs.
+
+A run appends one JSON line per completed item to
+``data/checkpoints/<name>.jsonl``. Lines are buffered and flushed every
+``flush_every`` items or ``flush_interval`` seconds (and always on exit,
+including Ctrl-C), so a crash loses at most one flush window. Resuming
+reads the journal back and skips every item it lists; a run that
+finishes cleanly removes its journal.
+"""
+import json
+import os
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "data", "checkpoints")
+
+FLUSH_EVERY = 25        # completed items buffered before a flush
+FLUSH_INTERVAL = 5.0    # seconds between flushes at most
+
+
+def journal_path(name):
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(CHECKPOINT_DIR, f"{safe}.jsonl")
+
+
+class Checkpoint:
+    """Journal of completed items for one named run.
+
+    ``resume=False`` starts a fresh journal; ``resume=True`` loads the
+    existing one so ``is_done`` / ``payload`` reflect the interrupted run.
+    Use as a context manager so buffered entries are flushed on any exit.
+    """
+
+    def __init__(self, name, resume=False, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.name = name
+        self.path = journal_path(name)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._done = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        if resume:
+            self._load()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash mid-write
+                    self._done[entry["key"]] = entry.get("payload")
+        except FileNotFoundError:
+            pass
+        if self._done:
+            print(f"♻️ Resuming '{self.name}': {len(self._done)} item(s) already completed.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def __len__(self):
+        return len(self._done)
+
+    def is_done(self, key):
+        return key in self._done
+
+    def payload(self, key, default=None):
+        return self._done.get(key, default)
+
+    def payloads(self):
+        """Payloads of every completed item, in completion order."""
+        return list(self._done.values())
+
+    def record(self, key, payload=None):
+        """Mark ``key`` completed; flushes when the buffer is full or stale."""
+        with self._lock:
+            self._done[key] = payload
+            self._buffer.append(json.dumps({"key": key, "payload": payload}, ensure_ascii=False, default=str))
+            due = (len(self._buffer) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._buffer:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(self._buffer) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._buffer = []
+            self._last_flush = time.monotonic()
+
+    def complete(self):
+        """Drop the journal once the run has finished and its output is saved."""
+        with self._lock:
+            self._buffer = []
+            self._done = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
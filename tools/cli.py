@@ -1,6 +1,6 @@
 import os
 import re
-from . import google_search, youtube_search, reddit_search, academy_search, storage, geo, helpcenter_search
+from . import checkpoint, google_search, youtube_search, reddit_search, academy_search, storage, geo, helpcenter_search
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
@@ -20,6 +20,12 @@ def load_json(path):
 def save_json(data, path):
     storage.write_json(path, data)
 
+def ask_resume(name):
+    """Offer to resume the run ``name`` when an interrupted one left its checkpoint."""
+    if not os.path.exists(checkpoint.journal_path(name)):
+        return False
+    return input("An interrupted run was found. Resume it? (Y/N): ").strip().lower() == 'y'
+
 # ---------------------------------------------------------------------------
 # Google Search
 # ---------------------------------------------------------------------------
@@ -155,9 +161,10 @@ def prompt_youtube_channel_search():
 
     confirm = input("Do you want to start the YouTube channel-wide comment search? (Y/N): ").strip().lower()
     if confirm == 'y':
+        resume = input("Resume interrupted channel runs if any exist? (Y/N): ").strip().lower() == 'y'
         keywords = load_json(KEYWORDS_FILE)
         for ch in channel_list:
-            youtube_search.run_channel_wide_search(ch, keywords, raw_mode)
+            youtube_search.run_channel_wide_search(ch, keywords, raw_mode, resume=resume)
 
 def prompt_youtube_search():
     print("\n-- YouTube Search Options --")
@@ -177,28 +184,35 @@ def prompt_youtube_search():
 # ---------------------------------------------------------------------------
 def prompt_ledger_academy_search():
     print("\n-- Ledger Academy Scraper Options --")
-    print("1. Offline Sync (CSV → JSON)")
+    print("1. Offline Sync (CSV → article store)")
     print("2. Full Scrape (Web)")
     print("3. Export to CSV")
     print("4. Full Process (Sync, Scrape, and Export)")
+    print("5. Incremental Scrape (changed articles only)")
+    print("6. Sitemap Scan (new or modified articles from the sitemap)")
 
-    choice = input("Choose an option (1-4): ").strip()
+    choice = input("Choose an option (1-6): ").strip()
 
     if choice == "1":
-        print("🔄 Running Offline Sync (CSV → JSON)...")
+        print("🔄 Running Offline Sync (CSV → article store)...")
         academy_search.load_and_sync_articles()
     elif choice == "2":
         print("🌐 Running Full Web Scrape...")
-        academy_search.run_academy_keyword_scan()
+        academy_search.run_academy_keyword_scan(resume=ask_resume("academy_scan"))
     elif choice == "3":
         print("💾 Exporting Data to CSV...")
-        articles = academy_search.load_and_sync_articles()
-        academy_search.save_to_csv(articles)
+        academy_search.save_to_csv()
     elif choice == "4":
         print("🗂 Running Full Process (Sync, Scrape, Export)...")
-        academy_search.run_academy_keyword_scan()
+        academy_search.run_academy_keyword_scan(resume=ask_resume("academy_scan"))
+    elif choice == "5":
+        print("🔁 Running Incremental Scrape...")
+        academy_search.run_academy_keyword_scan(incremental=True, resume=ask_resume("academy_scan"))
+    elif choice == "6":
+        print("🗺️ Running Sitemap Scan...")
+        academy_search.run_academy_keyword_scan(use_sitemap=True, resume=ask_resume("academy_scan"))
     else:
-        print("Invalid choice. Please enter 1, 2, 3, or 4.")
+        print("Invalid choice. Please enter 1, 2, 3, 4, 5, or 6.")
 
 # ---------------------------------------------------------------------------
 # GEO Report
@@ -251,22 +265,24 @@ def main_menu():
         elif choice == "5":
             # Help Center
             print("\n-- Help Center Scraper --")
-            print("1. Offline Sync (CSV → JSON)")
+            print("1. Offline Sync (CSV → article store)")
             print("2. Full Scrape (Web)")
             print("3. Export to CSV")
             print("4. Full Process (Sync, Scrape, Export)")
-            sub = input("Choose an option (1-4): ").strip()
+            print("5. Incremental Scrape (changed articles only)")
+            sub = input("Choose an option (1-5): ").strip()
             if sub == "1":
                 helpcenter_search.load_and_sync_articles()
             elif sub == "2":
-                helpcenter_search.run_helpcenter_scrape()
+                helpcenter_search.run_helpcenter_scrape(resume=ask_resume("helpcenter_scrape"))
             elif sub == "3":
-                articles = helpcenter_search.load_and_sync_articles()
-                helpcenter_search.save_to_csv(articles)
+                helpcenter_search.save_to_csv()
             elif sub == "4":
-                helpcenter_search.run_helpcenter_scrape()
+                helpcenter_search.run_helpcenter_scrape(resume=ask_resume("helpcenter_scrape"))
+            elif sub == "5":
+                helpcenter_search.run_helpcenter_scrape(incremental=True, resume=ask_resume("helpcenter_scrape"))
             else:
-                print("Invalid choice. Please enter 1-4.")
+                print("Invalid choice. Please enter 1-5.")
         elif choice == "6":
             prompt_geo_report()
         elif choice == "7":
@@ -0,0 +1,167 @@
+"""Buffered JSONL event log for scraper failures.
+
+Events are queued in memory and appended to disk by a background thread
+every ``flush_interval`` seconds (or as soon as ``max_buffer`` events are
+waiting), so an outage costs one file append per flush instead of one per
+failed URL. Each line is a JSON object::
+
+    {"ts": ..., "url": ..., "host": ..., "stage": "fetch", "status": 503,
+     "reason": "http_error", "latency": 1.52, "attempt": 3, "detail": "..."}
+
+``summarize`` groups failures by reason and host and ``failed_urls``
+returns the URLs that failed in the latest run so they can be re-queued.
+"""
+import atexit
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlsplit
+
+FLUSH_INTERVAL = 2.0   # seconds between background flushes
+MAX_BUFFER = 500       # queued events that trigger an early flush
+
+RUN_STAGE = "run"      # marker written when a scraper run starts
+
+# Stages whose failures mean the item itself was not scraped. "api" events
+# are not among them: the HTML fallback decides whether an article failed.
+RETRY_STAGES = ("fetch", "scrape", "extract")
+# Reasons that record a detour rather than a failure.
+NOT_FAILURES = ("api_fallback",)
+
+
+class EventLog:
+    """Append-only JSONL log flushed by a daemon thread."""
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, max_buffer=MAX_BUFFER):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def log(self, url, stage, status, reason="", latency=None, attempt=None, detail=None):
+        event = {
+            "ts": datetime.utcnow().isoformat(),
+            "url": url or "",
+            "host": urlsplit(url or "").netloc.lower(),
+            "stage": stage,
+            "status": status,
+            "reason": reason,
+            "latency": round(latency, 3) if latency is not None else None,
+            "attempt": attempt,
+        }
+        if detail:
+            event["detail"] = str(detail)
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.max_buffer
+            self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def start_run(self, name):
+        """Write a run marker; ``failed_urls`` only looks past the latest one."""
+        self.log("", RUN_STAGE, "start", reason=name)
+
+    def flush(self):
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        if not events:
+            return
+        with self._write_lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+
+
+# =======================
+# READING & SUMMARIES
+# =======================
+def read_events(path):
+    """Yield events from a log file, skipping lines that are not valid JSON."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def last_run_events(path):
+    """Return the failure events written since the latest run marker."""
+    events = []
+    for event in read_events(path):
+        if event.get("stage") == RUN_STAGE:
+            events = []
+        else:
+            events.append(event)
+    return events
+
+
+def summarize(path, all_runs=False):
+    """Count failures by reason and by host (latest run unless ``all_runs``)."""
+    events = [e for e in read_events(path) if e.get("stage") != RUN_STAGE] if all_runs else last_run_events(path)
+    return {
+        "events": len(events),
+        "urls": len({e["url"] for e in events if e.get("url")}),
+        "by_reason": Counter(e.get("reason") or "unknown" for e in events),
+        "by_host": Counter(e.get("host") or "unknown" for e in events),
+    }
+
+
+def failed_urls(path, reasons=None, hosts=None, stages=RETRY_STAGES):
+    """URLs that failed in the latest run, in first-failure order.
+
+    Only events from ``stages`` count (``None`` for all) and ``NOT_FAILURES``
+    reasons are left out unless asked for in ``reasons``. ``reasons`` /
+    ``hosts`` restrict the result to those groups.
+    """
+    seen = {}
+    for event in last_run_events(path):
+        url = event.get("url")
+        if not url:
+            continue
+        if stages and event.get("stage") not in stages:
+            continue
+        if reasons and event.get("reason") not in reasons:
+            continue
+        if not reasons and event.get("reason") in NOT_FAILURES:
+            continue
+        if hosts and event.get("host") not in hosts:
+            continue
+        seen.setdefault(url, None)
+    return list(seen)
+
+
+def print_summary(path, all_runs=False):
+    summary = summarize(path, all_runs)
+    print(f"📋 {summary['events']} failure event(s) across {summary['urls']} URL(s) in {path}")
+    if summary["by_reason"]:
+        print("  By reason:")
+        for reason, n in summary["by_reason"].most_common():
+            print(f"    {n:>6}  {reason}")
+    if summary["by_host"]:
+        print("  By host:")
+        for host, n in summary["by_host"].most_common():
+            print(f"    {n:>6}  {host}")
+    return summary
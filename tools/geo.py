@@ -2,7 +2,7 @@ import os
 from collections import Counter
 from datetime import datetime, timedelta
 import pandas as pd
-from . import google_search, llm_probe, index_tracker, storage, reddit_search
+from . import google_search, llm_probe, index_tracker, storage, reddit_search, urls
 
 
 def serp_reddit(queries_file: str, top: int):
@@ -13,9 +13,8 @@ def serp_reddit(queries_file: str, top: int):
         results = google_search.search_google(q, site="reddit.com")
         reddit_hits = results[:top]
         for hit in reddit_hits:
-            url = hit.get("url", "")
-            parts = url.split("/")
-            subreddit = parts[4] if len(parts) > 4 else ""
+            segments = urls.path_segments(hit.get("url", ""))
+            subreddit = segments[1] if len(segments) > 1 and segments[0].lower() == "r" else ""
             hit.update({"query": q, "subreddit": subreddit})
             all_results.append(hit)
     ts = datetime.utcnow().strftime('%Y%m%d_%H%M')
@@ -1,44 +1,28 @@
-import time
-import random
 import requests
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import config
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+
+from . import http_client, http_cache, html_parser, urls
 
 # =======================
 # CONSTANTS
 # =======================
 GOOGLE_RESULTS_PER_QUERY = 10
-GOOGLE_QUERY_DELAY_MIN = 2
-GOOGLE_QUERY_DELAY_MAX = 4
-METADATA_FETCH_DELAY_MIN = 3
-METADATA_FETCH_DELAY_MAX = 5
 DAILY_QUERY_LIMIT = 100
 QUERY_COUNT = 0
-
-USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-              "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
-HEADERS = {'User-Agent': USER_AGENT}
-
-session = requests.Session()
-session.headers.update(HEADERS)
+METADATA_WORKERS = 8          # concurrent metadata fetches (1 = serial)
+METADATA_HEAD_ONLY = True     # stream pages only up to </head> for metadata
 
 # =======================
 # HELPER FUNCTIONS
 # =======================
-def sleep_random(min_sec, max_sec):
-    """Pause execution randomly within a range."""
-    sleep_time = random.uniform(min_sec, max_sec)
-    print(f"Sleeping for {sleep_time:.2f} seconds...")
-    time.sleep(sleep_time)
-
 def extract_domain(url):
     """Extracts the domain from a URL."""
-    parsed = urlparse(url)
-    return parsed.netloc.lower().replace("www.", "")
+    return urls.domain(url)
 
 def get_output_filename(base_name="google_search_results", folder="output"):
     """
@@ -59,62 +43,131 @@ def get_output_filename(base_name="google_search_results", folder="output"):
 # =======================
 # METADATA EXTRACTION
 # =======================
-def fetch_metadata(url):
+class HeadParser(HTMLParser):
+    """Collects <title> and <meta> tags from a document head.
+
+    Parsing stops at </head> or <body>, so it does no work on the page body
+    and builds no tree; ``find`` mirrors the BeautifulSoup lookups that
+    ``fetch_metadata`` needs.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.metas = []
+        self._in_title = False
+        self._title_parts = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "meta":
+            self.metas.append({k: (v or "") for k, v in attrs})
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "body":
+            self.done = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts)
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def find(self, attr, value):
+        """Return the attributes of the first <meta attr=value>, or ``None``."""
+        for meta in self.metas:
+            if meta.get(attr) == value:
+                return meta
+        return None
+
+
+def parse_head(markup):
+    parser = HeadParser()
+    parser.feed(markup)
+    parser.close()
+    if parser._in_title:
+        parser.title = "".join(parser._title_parts)
+    return parser
+
+
+class _SoupHead:
+    """Adapter giving a BeautifulSoup document the ``HeadParser`` interface."""
+
+    def __init__(self, soup):
+        self._soup = soup
+        title = soup.find('title')
+        self.title = title.text if title else None
+
+    def find(self, attr, value):
+        tag = self._soup.find('meta', attrs={attr: value})
+        return tag.attrs if tag else None
+
+
+def _meta_content(head, *lookups, default="N/A"):
+    tag = None
+    for attr, value in lookups:
+        tag = head.find(attr, value)
+        if tag:
+            break
+    return tag.get("content", "").strip() if tag and tag.get("content") else default
+
+
+def _extract_metadata(head):
+    return {
+        'title': head.title.strip() if head.title is not None else 'No Title',
+        'description': _meta_content(head, ('name', 'description'), default='No Description'),
+        'publication_date': _meta_content(head, ('property', 'article:published_time'), ('name', 'pubdate')),
+        'last_edit_date': _meta_content(head, ('property', 'article:modified_time'), ('name', 'lastmod')),
+        'author': _meta_content(head, ('name', 'author'), ('property', 'article:author')),
+    }
+
+
+def fetch_metadata(url, head_only=METADATA_HEAD_ONLY):
     """Scrape metadata from a given URL including title, description,
-       publication date, last edit date, and author."""
+       publication date, last edit date, and author.
+
+    With ``head_only`` the body is streamed only up to ``</head>`` (capped at
+    ``http_client.HEAD_MAX_BYTES``) and parsed with ``HeadParser``; otherwise
+    the whole page is downloaded and parsed with the configured
+    ``html_parser`` backend. Any failure yields an all-"Error" row, so one
+    bad page (network, cache or parse error) never aborts the run.
+    """
     try:
         print(f"Fetching metadata for URL: {url}")
-        response = session.get(url, timeout=10)
+        response = http_cache.get(url, headers=http_client.HTML_HEADERS, timeout=10, head_only=head_only)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Title and description
-        title = soup.find('title').text.strip() if soup.find('title') else 'No Title'
-        description_tag = soup.find('meta', attrs={'name': 'description'})
-        description = (description_tag.get('content', '').strip() 
-                       if description_tag and description_tag.get('content') 
-                       else 'No Description')
-        
-        # Publication Date
-        pub_date_tag = soup.find("meta", property="article:published_time")
-        if not pub_date_tag:
-            pub_date_tag = soup.find("meta", attrs={"name": "pubdate"})
-        publication_date = (pub_date_tag.get("content", "").strip() 
-                            if pub_date_tag and pub_date_tag.get("content") 
-                            else "N/A")
-        
-        # Last Edit Date
-        last_edit_tag = soup.find("meta", property="article:modified_time")
-        if not last_edit_tag:
-            last_edit_tag = soup.find("meta", attrs={"name": "lastmod"})
-        last_edit_date = (last_edit_tag.get("content", "").strip() 
-                          if last_edit_tag and last_edit_tag.get("content") 
-                          else "N/A")
-        
-        # Author
-        author_tag = soup.find("meta", attrs={"name": "author"})
-        if not author_tag:
-            author_tag = soup.find("meta", property="article:author")
-        author = (author_tag.get("content", "").strip() 
-                  if author_tag and author_tag.get("content") 
-                  else "N/A")
-        
-        return {
-            'title': title,
-            'description': description,
-            'publication_date': publication_date,
-            'last_edit_date': last_edit_date,
-            'author': author
-        }
+        if response.from_cache:
+            cached = http_cache.load_parsed(url, "metadata", head_only=head_only)
+            if cached:
+                return cached
+        if head_only:
+            head = parse_head(response.text)
+        else:
+            head = _SoupHead(html_parser.make_soup(response.content))
+        metadata = _extract_metadata(head)
+        http_cache.store_parsed(url, "metadata", metadata, head_only=head_only)
+        return metadata
     except requests.exceptions.RequestException as e:
         print(f"Error fetching metadata for {url}: {e}")
-        return {
-            'title': 'Error',
-            'description': 'Error',
-            'publication_date': 'Error',
-            'last_edit_date': 'Error',
-            'author': 'Error'
-        }
+    except Exception as e:
+        print(f"Error extracting metadata for {url}: {e!r}")
+    return {
+        'title': 'Error',
+        'description': 'Error',
+        'publication_date': 'Error',
+        'last_edit_date': 'Error',
+        'author': 'Error'
+    }
 
 # =======================
 # GOOGLE SEARCH FUNCTIONS
@@ -136,7 +189,7 @@ def search_google(keyword, site=None):
 
     try:
         print(f"Performing Google search with query: {query}")
-        response = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=10)
+        response = http_client.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=10)
         response.raise_for_status()
         QUERY_COUNT += 1
         items = response.json().get("items", [])
@@ -146,37 +199,59 @@ def search_google(keyword, site=None):
         print(f"Error during Google search for query '{query}': {e}")
         return []
 
-def run_google_search(websites, keywords, pages_per_keyword):
-    """Executes the Google Search process."""
-    all_results = []
+def _metadata_row(site, kw, url, metadata):
+    return {
+        'Website': site,
+        'Keyword': kw,
+        'URL': url,
+        'Title': metadata.get('title', ''),
+        'Description': metadata.get('description', ''),
+        'Publication Date': metadata.get('publication_date', ''),
+        'Last Edit Date': metadata.get('last_edit_date', ''),
+        'Author': metadata.get('author', '')
+    }
+
+def run_google_search(websites, keywords, pages_per_keyword, workers=METADATA_WORKERS):
+    """Executes the Google Search process.
+
+    Search API calls run in order on the calling thread; metadata for each
+    result is fetched on a pool of ``workers`` threads while the next query
+    runs. Rows are collected in submission order, so the CSV comes out the
+    same as a serial run regardless of which fetch finishes first. A URL
+    returned by several queries is fetched once per run.
+    """
+    pending = []
+    seen = urls.UrlRegistry()
+    fetched = {}  # URL ID -> metadata (or its future)
     print("Starting Google Search Process...")
 
-    for site in websites:
-        print(f"\nProcessing site: {site}")
-        for kw in keywords:
-            print(f"  Searching for keyword: '{kw}'")
-            for page in range(1, pages_per_keyword + 1):
-                print(f"    Page {page}/{pages_per_keyword}: Performing search query...")
-                results = search_google(kw, site)
-                if results:
-                    print(f"      Found {len(results)} result(s).")
-                else:
-                    print("      No results found or API error.")
-                for res in results:
-                    print(f"        Fetching metadata for URL: {res['url']}")
-                    metadata = fetch_metadata(res['url'])
-                    print(f"          Metadata: Title: {metadata['title']}")
-                    all_results.append({
-                        'Website': site,
-                        'Keyword': kw,
-                        'URL': res['url'],
-                        'Title': metadata.get('title', ''),
-                        'Description': metadata.get('description', ''),
-                        'Publication Date': metadata.get('publication_date', ''),
-                        'Last Edit Date': metadata.get('last_edit_date', ''),
-                        'Author': metadata.get('author', '')
-                    })
-                sleep_random(GOOGLE_QUERY_DELAY_MIN, GOOGLE_QUERY_DELAY_MAX)
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for site in websites:
+            print(f"\nProcessing site: {site}")
+            for kw in keywords:
+                print(f"  Searching for keyword: '{kw}'")
+                for page in range(1, pages_per_keyword + 1):
+                    print(f"    Page {page}/{pages_per_keyword}: Performing search query...")
+                    results = search_google(kw, site)
+                    if results:
+                        print(f"      Found {len(results)} result(s).")
+                    else:
+                        print("      No results found or API error.")
+                    for res in results:
+                        if seen.add(res['url']):
+                            fetched[seen.id_for(res['url'])] = executor.submit(fetch_metadata, res['url']) if executor else fetch_metadata(res['url'])
+                        pending.append((site, kw, res['url'], fetched[seen.id_for(res['url'])]))
+
+        all_results = []
+        for site, kw, url, metadata in pending:
+            if executor:
+                metadata = metadata.result()
+            print(f"          Metadata: Title: {metadata['title']}")
+            all_results.append(_metadata_row(site, kw, url, metadata))
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
 
     output_file = get_output_filename()
     fieldnames = ['Website', 'Keyword', 'URL', 'Title', 'Description', 
@@ -1,13 +1,15 @@
 import os
 import csv
 import json
-import time
 import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from random import uniform
 
 import requests
-from bs4 import BeautifulSoup
+
+from . import article_store, checkpoint, event_log, http_client, http_cache, html_parser, host_health, keyword_matcher, rate_limit, storage, urls
 
 # =======================
 # FILE PATHS
@@ -18,8 +20,14 @@ OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 INPUT_DIR = os.path.join(BASE_DIR, "input")
 
 CSV_IMPORT_FILE = os.path.join(INPUT_DIR, "helpcenter_articles_import.csv")
-ARTICLES_FILE = os.path.join(DATA_DIR, "helpcenter_articles.json")
-LOG_FILE = os.path.join(OUTPUT_DIR, "helpcenter_scrape_log.txt")
+ARTICLES_FILE = os.path.join(DATA_DIR, "helpcenter_articles.json")  # JSON export; imported into an empty store
+STORE_FILE = os.path.join(DATA_DIR, "helpcenter_articles.db")
+LOG_FILE = os.path.join(OUTPUT_DIR, "helpcenter_scrape_log.jsonl")
+SECTIONS_FILE = os.path.join(DATA_DIR, "helpcenter_sections.json")
+SECTION_CACHE_TTL = 24 * 3600  # seconds before the section catalog is reloaded
+INDEX_FILE = os.path.join(DATA_DIR, "helpcenter_article_index.json")
+
+HELPCENTER_WORKERS = 8  # articles scraped in parallel (1 = serial)
 
 for d in (DATA_DIR, OUTPUT_DIR, INPUT_DIR):
     os.makedirs(d, exist_ok=True)
@@ -28,49 +36,44 @@ for d in (DATA_DIR, OUTPUT_DIR, INPUT_DIR):
 # =======================
 # Helpers
 # =======================
-def log_failure(url, reason):
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{datetime.utcnow().isoformat()}\t{url}\t{reason}\n")
+EVENTS = event_log.EventLog(LOG_FILE)
+
+
+def log_failure(url, reason, stage="scrape", status=None, latency=None, attempt=None, detail=None):
+    EVENTS.log(url, stage, status, reason, latency=latency, attempt=attempt, detail=detail)
 
 
 def _safe_removesuffix(s: str, suf: str) -> str:
     return s[:-len(suf)] if suf and s.endswith(suf) else s
 
 
-def fetch_page(url, retries=3):
-    session = requests.Session()
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.google.com/",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-        "DNT": "1",
-    }
-    for attempt in range(retries):
+def _fetch_html(url, retries=3):
+    """Return the 200 response for ``url`` (possibly replayed from cache) or ``None``."""
+    for attempt in range(1, retries + 1):
+        started = time.monotonic()
         try:
-            resp = session.get(url, headers=headers, timeout=20, allow_redirects=True)
+            resp = http_cache.get(url, headers=http_client.HTML_HEADERS)
             if resp.status_code == 200:
-                return BeautifulSoup(resp.text, "html.parser")
+                return resp
             elif resp.status_code == 429:
-                wait = 2 ** attempt + uniform(0.5, 2.5)
-                time.sleep(wait)
+                # The host limiter has already paused for Retry-After / backoff.
+                if attempt == retries:
+                    log_failure(url, "rate_limited", "fetch", 429, time.monotonic() - started, attempt)
+                continue
             else:
-                log_failure(url, f"HTTP {resp.status_code}")
+                log_failure(url, "http_error", "fetch", resp.status_code, time.monotonic() - started, attempt)
                 break
         except Exception as e:
-            if attempt == retries - 1:
-                log_failure(url, f"Exception: {e}")
-            wait = 1.5 * (attempt + 1)
-            time.sleep(wait)
+            if attempt == retries:
+                log_failure(url, "exception", "fetch", "exception", time.monotonic() - started, attempt, detail=e)
     return None
 
 
+def fetch_page(url, retries=3):
+    resp = _fetch_html(url, retries)
+    return html_parser.make_soup(resp.text) if resp is not None else None
+
+
 # =======================
 # Zendesk (Help Center) API helpers
 # =======================
@@ -88,83 +91,216 @@ def _normalize_url(url: str) -> str:
     url = (url or "").strip()
     if not url:
         return ""
-    if url.startswith("http://") or url.startswith("https://"):
-        return url
-    if url.startswith("support.ledger.com"):
-        return f"https://{url}"
+    if "://" in url or url.startswith("support.ledger.com"):
+        return urls.canonicalize(url)
     # Accept raw IDs like "115005165269-zd", slugs, or "article/<slug>"
     u = url.lstrip("/")
     if u.startswith("article/"):
         u = u[len("article/"):]
-    return f"https://support.ledger.com/article/{u}"
+    return urls.canonicalize(f"https://support.ledger.com/article/{u}")
 
 
-def _zd_get_json(url: str, retries: int = 3):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/124 Safari/537.36",
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-        "Referer": "https://support.ledger.com/",
-    }
+ZD_HOSTS = ("support.ledger.com", "ledger.zendesk.com")
+ZD_LOCALE = "en-us"
+ZD_PAGE_SIZE = 100
+ZD_HEADERS = {**http_client.JSON_HEADERS, "Referer": "https://support.ledger.com/"}
+ZD_FAILURE_THRESHOLD = 2   # consecutive host failures before its circuit opens
+ZD_HOST_COOLDOWN = 300     # seconds a failing host is skipped
+
+ZD_HEALTH = host_health.HostHealth(ZD_HOSTS, ZD_FAILURE_THRESHOLD, ZD_HOST_COOLDOWN)
+
+
+def _zd_api_failure(url, article_url, reason, status, started, attempt, detail=None):
+    # Failures while resolving an article are logged under the article URL,
+    # with the API URL in the detail, so they group with its other events.
+    if article_url:
+        detail = f"api={url}" + (f"; {detail}" if detail else "")
+    log_failure(article_url or url, reason, "api", status, time.monotonic() - started, attempt, detail=detail)
+
+
+def _zd_get_json(url: str, retries: int = 3, article_url: str = None):
+    """GET a Zendesk API URL and return the decoded JSON, or ``None``.
+
+    Outcomes feed ``ZD_HEALTH``: JSON answers and client errors (e.g. 404)
+    count as a healthy host; exceptions, 5xx and non-JSON bodies count as
+    failures. Retries stop as soon as the host's circuit opens.
+    """
+    host = http_client.host_of(url)
     for attempt in range(retries):
+        if ZD_HEALTH.is_open(host):
+            return None
+        started = time.monotonic()
         try:
-            r = requests.get(url, headers=headers, timeout=20, allow_redirects=True)
+            r = http_cache.get(url, headers=ZD_HEADERS)
             ct = r.headers.get("Content-Type", "")
             if r.status_code == 200 and ("json" in ct.lower()):
                 try:
-                    return r.json()
+                    data = r.json()
+                    ZD_HEALTH.record_success(host)
+                    return data
                 except json.JSONDecodeError as e:
-                    log_failure(url, f"API non-JSON 200: {e}")
-                    time.sleep(2 ** attempt + uniform(0.25, 0.75))
+                    _zd_api_failure(url, article_url, "api_non_json", 200, started, attempt + 1, detail=e)
+                    ZD_HEALTH.record_failure(host)
+                    rate_limit.pause(host, 2 ** attempt)
                     continue
             if r.status_code == 429:
-                time.sleep(2 ** attempt + uniform(0.5, 1.5))
                 continue
             if r.status_code in (301, 302, 303, 307, 308):
                 loc = r.headers.get("Location")
                 if loc:
                     url = loc
                     continue
-            log_failure(url, f"API HTTP {r.status_code} CT={ct}")
+            _zd_api_failure(url, article_url, "api_http_error", r.status_code, started, attempt + 1, detail=f"CT={ct}")
+            if r.status_code >= 500 or r.status_code == 200:
+                ZD_HEALTH.record_failure(host)
+            else:
+                ZD_HEALTH.record_success(host)
             return None
         except Exception as e:
+            ZD_HEALTH.record_failure(host)
             if attempt == retries - 1:
-                log_failure(url, f"API exception: {e}")
-            time.sleep(1.0 * (attempt + 1))
+                _zd_api_failure(url, article_url, "api_exception", "exception", started, attempt + 1, detail=e)
     return None
 
 
-def _zd_article_by_id(article_id: str):
-    # Try both hosts for resiliency
-    for host in ("support.ledger.com", "ledger.zendesk.com"):
+def _zd_article_by_id(article_id: str, article_url: str = None):
+    # Try both hosts for resiliency, healthiest first
+    for host in ZD_HEALTH.ordered():
         api = f"https://{host}/api/v2/help_center/articles/{article_id}.json"
-        data = _zd_get_json(api)
+        data = _zd_get_json(api, article_url=article_url)
         if data and data.get("article"):
             return data
     return None
 
 
-def _zd_search_article(query: str, locale: str = "en-us"):
+def _zd_search_article(query: str, locale: str = "en-us", article_url: str = None):
     q = requests.utils.quote(query)
-    for host in ("support.ledger.com", "ledger.zendesk.com"):
+    for host in ZD_HEALTH.ordered():
         api = f"https://{host}/api/v2/help_center/articles/search.json?query={q}&locale={locale}"
-        data = _zd_get_json(api)
+        data = _zd_get_json(api, article_url=article_url)
         if data and data.get("results"):
             return data
     return None
 
 
+_sections = None
+_sections_lock = threading.Lock()
+
+
+def load_section_catalog(force: bool = False) -> dict:
+    """Return the section id → name catalog, loading it at most once per TTL.
+
+    The catalog is read from ``SECTIONS_FILE`` while it is younger than
+    ``SECTION_CACHE_TTL``; otherwise all sections are fetched in one
+    paginated pass and persisted. A failed refresh keeps the stale copy.
+    """
+    global _sections
+    with _sections_lock:
+        if _sections is not None and not force:
+            return _sections
+        cached = storage.load_json(SECTIONS_FILE, {})
+        fresh = cached and time.time() - cached.get("fetched_at", 0) < SECTION_CACHE_TTL
+        if fresh and not force:
+            _sections = cached.get("sections", {})
+            return _sections
+        path = f"/api/v2/help_center/{ZD_LOCALE}/sections.json?per_page={ZD_PAGE_SIZE}"
+        sections = {str(sec["id"]): sec.get("name", "") for sec in _zd_paginate(path, "sections") if sec.get("id") is not None}
+        if sections:
+            storage.write_json(SECTIONS_FILE, {"fetched_at": int(time.time()), "sections": sections})
+            _sections = sections
+        else:
+            _sections = (cached or {}).get("sections", {})
+        return _sections
+
+
 def _zd_section_name(section_id: int) -> str:
-    for host in ("support.ledger.com", "ledger.zendesk.com"):
+    catalog = load_section_catalog()
+    name = catalog.get(str(section_id))
+    if name is not None:
+        return name
+    # Sections created since the catalog was loaded
+    for host in ZD_HEALTH.ordered():
         api = f"https://{host}/api/v2/help_center/sections/{section_id}.json"
         data = _zd_get_json(api)
         if data and data.get("section"):
-            return data["section"].get("name", "")
+            name = data["section"].get("name", "")
+            with _sections_lock:
+                catalog[str(section_id)] = name
+            return name
     return ""
 
 
+def _zd_paginate(path: str, key: str):
+    """Yield every item under ``key`` across all pages of a list endpoint.
+
+    Pages are followed through ``next_page`` until a page is empty, the
+    incremental endpoints report ``end_of_stream``, or ``next_page`` points
+    at a page already read (the incremental endpoints keep offering one at
+    the end). A host is abandoned only if its first page fails; a failure
+    mid-way ends the listing with what was collected, and callers fall
+    back to per-item lookups for the rest.
+    """
+    for host in ZD_HEALTH.ordered():
+        url = f"https://{host}{path}"
+        fetched = set()
+        while url and url not in fetched:
+            data = _zd_get_json(url)
+            if not data:
+                break
+            fetched.add(url)
+            items = data.get(key) or []
+            yield from items
+            if not items or data.get("end_of_stream"):
+                break
+            url = data.get("next_page")
+        if fetched:
+            return
+
+
+def prefetch_articles(since=None, locale: str = ZD_LOCALE):
+    """Build an id → article index from the bulk Zendesk endpoints.
+
+    Without ``since`` the full ``articles.json`` listing is paged through
+    (``ZD_PAGE_SIZE`` per page). With ``since`` (a unix timestamp) only the
+    incremental endpoint is read, returning articles changed after it.
+    """
+    if since:
+        path = f"/api/v2/help_center/incremental/articles.json?start_time={int(since)}"
+    else:
+        path = f"/api/v2/help_center/{locale}/articles.json?per_page={ZD_PAGE_SIZE}&sort_by=position"
+    index = {}
+    for art in _zd_paginate(path, "articles"):
+        if art.get("id") is not None:
+            index[str(art["id"])] = art
+    return index
+
+
+def load_article_index(incremental=False, locale: str = ZD_LOCALE):
+    """Return the prefetched article index, persisted in ``INDEX_FILE``.
+
+    With ``incremental`` and a saved index for ``locale``, only the articles
+    changed since it was fetched are requested and merged in; otherwise the
+    full listing is read. The saved timestamp only advances when the
+    delta returned something, so a failed request is retried next run.
+    """
+    cached = storage.load_json(INDEX_FILE, {})
+    started = int(time.time())
+    if incremental and cached.get("locale") == locale and cached.get("fetched_at"):
+        index = cached.get("articles", {})
+        changed = prefetch_articles(since=cached["fetched_at"], locale=locale)
+        changed = {aid: art for aid, art in changed.items() if art.get("locale", locale) == locale}
+        print(f"🔄 {len(changed)} article(s) changed since the last prefetch.")
+        if not changed:
+            return index
+        index.update(changed)
+    else:
+        index = prefetch_articles(locale=locale)
+        if not index:
+            return cached.get("articles", {}) if cached.get("locale") == locale else {}
+    storage.write_json(INDEX_FILE, {"fetched_at": started, "locale": locale, "articles": index})
+    return index
+
+
 def load_keywords():
     path = os.path.join(DATA_DIR, "keywords.json")
     try:
@@ -175,25 +311,29 @@ def load_keywords():
 
 
 # =======================
-# CSV → JSON merge
+# Article store + CSV merge
 # =======================
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the shared article store, importing ``ARTICLES_FILE`` on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = article_store.ArticleStore(STORE_FILE, canonicalize=_normalize_url, legacy_json=ARTICLES_FILE)
+        return _store
+
+
 def load_and_sync_articles():
     """
-    Load helpcenter_articles.json and merge with CSV import if present.
+    Merge the CSV import (if present) into the article store and return it.
+    Only new URLs and newly known titles are written.
     Expected CSV headers: Title, URL
     """
-    print("🔍 Loading help center articles (CSV → JSON sync)...")
-    existing = []
-    if os.path.exists(ARTICLES_FILE):
-        with open(ARTICLES_FILE, "r", encoding="utf-8") as f:
-            existing = json.load(f)
-    by_url = {}
-    for a in existing:
-        norm = _normalize_url(a.get("url"))
-        if not norm:
-            continue
-        a["url"] = norm
-        by_url[norm] = a
+    print("🔍 Loading help center articles (CSV → store sync)...")
+    store = get_store()
 
     added = 0
     if os.path.exists(CSV_IMPORT_FILE):
@@ -218,8 +358,9 @@ def load_and_sync_articles():
                 title = (row.get("Title") or row.get("title") or "").strip()
                 if not url:
                     continue
-                if url not in by_url:
-                    by_url[url] = {
+                existing = store.get(url)
+                if existing is None:
+                    store.upsert({
                         "url": url,
                         "title": title or "",
                         "publish_date": "",
@@ -227,17 +368,14 @@ def load_and_sync_articles():
                         "summary": "",
                         "updated": "",
                         "keywords": {},
-                    }
+                    })
                     added += 1
-                else:
-                    if title and not by_url[url].get("title"):
-                        by_url[url]["title"] = title
+                elif title and not existing.get("title"):
+                    existing["title"] = title
+                    store.upsert(existing)
 
-    merged = list(by_url.values())
-    with open(ARTICLES_FILE, "w", encoding="utf-8") as f:
-        json.dump(merged, f, indent=2, ensure_ascii=False)
-    print(f"✅ Sync complete. {len(merged)} total article(s), {added} added from CSV.")
-    return merged
+    print(f"✅ Sync complete. {len(store)} total article(s), {added} added from CSV.")
+    return store
 
 
 # =======================
@@ -356,34 +494,64 @@ def _extract_dates(soup):
     return normalize(pub), normalize(mod)
 
 
-def _count_keywords(text, keywords):
-    t = text.lower()
-    return {kw: t.count(kw.lower()) for kw in keywords}
+class ScrapeContext:
+    """Per-run state shared by every ``scrape_article`` call.
+
+    Keywords are read from disk and compiled into one matcher per run
+    instead of once per article. The context is read-only after construction, so one
+    instance is shared by all worker threads.
+    """
+
+    def __init__(self, keywords=None, index=None, incremental=False):
+        self.keywords = load_keywords() if keywords is None else keywords
+        self.matcher = keyword_matcher.KeywordMatcher(self.keywords)
+        self.keywords_fingerprint = storage.fingerprint(self.keywords)
+        self.index = index or {}
+        self.incremental = incremental
+
+    def count_keywords(self, text):
+        return self.matcher.count(text)
 
 
 # =======================
 # Scrape single article
 # =======================
-def scrape_article(article):
+def scrape_article(article, context=None):
+    """Fill in ``article`` from the Zendesk API, falling back to the HTML page.
+
+    ``context`` is the run's ``ScrapeContext``; a fresh one is built when it
+    is omitted. Articles found in ``context.index`` (from
+    ``prefetch_articles``) are resolved without any per-article API call.
+    Every scrape stores a ``fingerprint`` (Zendesk ``updated_at`` or a hash
+    of the page text, plus the keyword list). With ``context.incremental`` an
+    article whose fingerprint is unchanged keeps its previous summary and
+    keyword counts and nothing is re-extracted. Each body is converted to
+    text once and that text feeds the summary, the keyword counts and the
+    fingerprint. Returns ``None`` when the article could not be fetched at
+    all (the failure is already in the event log).
+    """
+    ctx = context or ScrapeContext()
     # Normalize at point of use, persist normalized form
     url = _normalize_url(article.get("url") or article.get("link"))
     if not url:
-        return article
+        return None
     article["url"] = url
 
     # Preferred path: Zendesk Help Center API for Ledger
     if _is_ledger_support(url):
         aid = _extract_article_id(url)
         data = None
-        if aid:
-            data = _zd_article_by_id(aid)
+        if aid and aid in ctx.index:
+            data = {"article": ctx.index[aid]}
+        elif aid:
+            data = _zd_article_by_id(aid, article_url=url)
         if not data or not data.get("article"):
             # Fall back to search by title or slug
             q = (
                 article.get("title")
                 or _safe_removesuffix(url.rstrip("/").split("/")[-1], "-zd").replace("-", " ")
             )
-            res = _zd_search_article(q)
+            res = _zd_search_article(q, article_url=url)
             items = (res or {}).get("results", [])
             if items:
                 chosen = None
@@ -408,6 +576,11 @@ def scrape_article(article):
 
         if data and data.get("article"):
             art = data["article"]
+            fp = storage.fingerprint("zd", art.get("id"), art.get("updated_at") or art.get("body", ""), ctx.keywords)
+            if ctx.incremental and article.get("fingerprint") == fp:
+                return article
+            article["fingerprint"] = fp
+            article["keywords_fingerprint"] = ctx.keywords_fingerprint
 
             # Title
             if not article.get("title"):
@@ -432,25 +605,35 @@ def scrape_article(article):
 
             # Summary from body
             body_html = art.get("body", "")
+            body_text = html_parser.html_to_text(body_html)
             if body_html:
-                body_text = BeautifulSoup(body_html, "html.parser").get_text(" ", strip=True)
                 sentences = re.split(r"(?<=[.!?])\s+", body_text)
                 article["summary"] = " ".join(sentences[:3])[:1000]
 
             # Keywords
-            keywords = load_keywords()
-            if keywords and (art.get("body") or art.get("title")):
-                all_text = f"{art.get('title','')} {BeautifulSoup(art.get('body',''), 'html.parser').get_text(' ', strip=True)}"
-                article["keywords"] = _count_keywords(all_text, keywords)
+            if ctx.keywords and (body_html or art.get("title")):
+                all_text = f"{art.get('title','')} {body_text}"
+                article["keywords"] = ctx.count_keywords(all_text)
 
             return article
         else:
-            log_failure(url, "API path failed; falling back to HTML scrape")
+            log_failure(url, "api_fallback", "api", detail="API path failed; falling back to HTML scrape")
 
     # Fallback: HTML scraping
-    soup = fetch_page(url)
-    if not soup:
+    resp = _fetch_html(url)
+    if resp is None:
+        return None
+    # A 304 means the page is byte-for-byte what we extracted last time;
+    # reuse it only if that extraction counted the same keywords.
+    if ctx.incremental and resp.from_cache and article.get("keywords_fingerprint") == ctx.keywords_fingerprint:
         return article
+    soup = html_parser.make_soup(resp.text)
+    all_text = soup.get_text(" ", strip=True)
+    fp = storage.fingerprint("html", storage.normalize_text(all_text), ctx.keywords)
+    if ctx.incremental and article.get("fingerprint") == fp:
+        return article
+    article["fingerprint"] = fp
+    article["keywords_fingerprint"] = ctx.keywords_fingerprint
 
     if not article.get("title"):
         h1 = soup.find("h1")
@@ -470,10 +653,8 @@ def scrape_article(article):
     summary = _extract_summary(soup)
     article["summary"] = summary
 
-    keywords = load_keywords()
-    if keywords:
-        all_text = soup.get_text(" ", strip=True)
-        article["keywords"] = _count_keywords(all_text, keywords)
+    if ctx.keywords:
+        article["keywords"] = ctx.count_keywords(all_text)
 
     return article
 
@@ -481,52 +662,150 @@ def scrape_article(article):
 # =======================
 # Save to CSV
 # =======================
-def save_to_csv(articles):
+def _csv_row(a):
+    return {
+        "Title": a.get("title", ""),
+        "Publish Date": a.get("publish_date", ""),
+        "Topic": a.get("topic", ""),
+        "Summary": a.get("summary", ""),
+        "URL": a.get("url") or a.get("link", ""),
+    }
+
+
+def save_to_csv(articles=None):
+    """Write the CSV export; streams straight from the store when ``articles`` is omitted."""
     ts = datetime.now().strftime("%m%d%y")
     out = os.path.join(OUTPUT_DIR, f"helpcenter_articles_{ts}.csv")
     headers = ["Title", "Publish Date", "Topic", "Summary", "URL"]
-    with open(out, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for a in articles:
-            writer.writerow({
-                "Title": a.get("title", ""),
-                "Publish Date": a.get("publish_date", ""),
-                "Topic": a.get("topic", ""),
-                "Summary": a.get("summary", ""),
-                "URL": a.get("url") or a.get("link", ""),
-            })
+    if articles is None:
+        get_store().export_csv(out, headers, _csv_row)
+    else:
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            for a in articles:
+                writer.writerow(_csv_row(a))
     print(f"✅ Data saved to {out}")
 
 
 # =======================
 # Main orchestration
 # =======================
-def run_helpcenter_scrape():
-    articles = load_and_sync_articles()
-    if not articles:
-        print("⚠️ No articles found to scrape. Ensure CSV has rows and correct headers (Title, URL).")
-        save_to_csv([])
-        return
-
-    for i, a in enumerate(articles, 1):
+def _iter_jobs(store, journal=None, only=None):
+    for i, a in enumerate(store.iter_articles(), 1):
+        if journal is not None and journal.is_done(a.get("url")):
+            continue
+        if only is not None and a.get("url") not in only:
+            continue
         # Normalize and guard
         a["url"] = _normalize_url(a.get("url") or a.get("link"))
         if not a["url"].startswith("http"):
-            log_failure(a.get("url") or "", "Refusing to fetch non-HTTP URL after normalization")
+            log_failure(a.get("url") or "", "invalid_url", "queue", detail="Refusing to fetch non-HTTP URL after normalization")
             print(f"⚠️ Skipping {i}: not a valid URL after normalization → {a['url']!r}")
             continue
+        yield a
 
-        print(f"Scraping {i}/{len(articles)}: {a['url']}")
-        updated = scrape_article(a)
-        articles[i - 1] = updated
 
-    with open(ARTICLES_FILE, "w", encoding="utf-8") as f:
-        json.dump(articles, f, indent=2, ensure_ascii=False)
+def save_to_json():
+    """Write every stored article to ``ARTICLES_FILE`` as a JSON array."""
+    count = get_store().export_json(ARTICLES_FILE)
+    print(f"✅ {count} article(s) saved to {ARTICLES_FILE}")
 
-    save_to_csv(articles)
-    print("✅ Help Center scrape complete")
 
+def run_helpcenter_scrape(workers=HELPCENTER_WORKERS, prefetch=True, incremental=False, resume=False, only_urls=None):
+    """Scrape every known article on a pool of ``workers`` threads.
+
+    All workers share the per-host rate limiter in ``http_client``. Articles
+    are streamed from the store, at most a few per worker in flight, and each
+    one is upserted as soon as it finishes; the store keeps the original
+    article order for the CSV export. With ``prefetch`` the Zendesk article
+    listing is loaded in bulk first so most articles need no API call of
+    their own. ``incremental`` skips re-extraction for articles whose
+    fingerprint has not changed and refreshes the saved listing with only
+    the articles changed since the last prefetch. Finished articles are journalled in a
+    checkpoint; ``resume`` continues an interrupted run after the last
+    completed article. ``only_urls`` limits the run to those articles (e.g. the
+    ``event_log.failed_urls`` of the previous run).
+    """
+    store = load_and_sync_articles()
+    total = len(store)
+    if not total:
+        print("⚠️ No articles found to scrape. Ensure CSV has rows and correct headers (Title, URL).")
+        save_to_csv([])
+        return
+    only = None
+    if only_urls is not None:
+        only = {_normalize_url(u) for u in only_urls}
+        total = len(only)
+        print(f"🔁 Re-queued {total} article(s).")
+    EVENTS.start_run("helpcenter_scrape")
+
+    index = {}
+    if prefetch and any(_is_ledger_support(_normalize_url(a.get("url"))) for a in store.iter_articles()):
+        print("📚 Prefetching Zendesk article index...")
+        index = load_article_index(incremental)
+        print(f"✅ Indexed {len(index)} article(s) from the Help Center API.")
+
+    context = ScrapeContext(index=index, incremental=incremental)
+    journal = checkpoint.Checkpoint("helpcenter_scrape", resume=resume)
+    resumed = len(journal)
+    counts = {"done": 0, "unchanged": 0, "failed": 0}
+
+    def finish(article, previous):
+        # Failed articles stay out of the journal so ``resume`` retries them.
+        if article is None:
+            counts["failed"] += 1
+            return
+        store.upsert(article)
+        journal.record(article["url"])
+        counts["done"] += 1
+        if previous and previous == article.get("fingerprint"):
+            counts["unchanged"] += 1
+
+    with journal:
+        if workers <= 1:
+            for a in _iter_jobs(store, journal, only):
+                print(f"Scraping {resumed + counts['done'] + 1}/{total}: {a['url']}")
+                previous = a.get("fingerprint")
+                finish(scrape_article(a, context), previous)
+        else:
+            if workers > http_client.POOL_MAXSIZE:
+                http_client.configure(pool_maxsize=workers)
+            max_pending = workers * 4
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = {}
+
+                def drain(block_until):
+                    while len(pending) > block_until:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            a, previous = pending.pop(future)
+                            try:
+                                finish(future.result(), previous)
+                            except Exception as e:
+                                counts["failed"] += 1
+                                log_failure(a["url"], "worker_exception", "scrape", "exception", detail=e)
+                            print(f"Scraped {resumed + counts['done']}/{total}: {a['url']}")
+
+                for a in _iter_jobs(store, journal, only):
+                    pending[executor.submit(scrape_article, a, context)] = (a, a.get("fingerprint"))
+                    drain(max_pending)
+                drain(0)
+
+    if resumed:
+        print(f"♻️ {resumed} article(s) were already done before resuming.")
+    if incremental:
+        unchanged = counts["unchanged"]
+        print(f"⏭️ {unchanged} unchanged article(s) reused, {counts['done'] - unchanged} re-extracted.")
+    if counts["failed"]:
+        print(f"❌ {counts['failed']} article(s) failed; use --retry-failed or --resume to try them again.")
+
+    save_to_csv()
+    save_to_json()
+    journal.complete()
+    EVENTS.flush()
+    event_log.print_summary(LOG_FILE)
+    print("✅ Help Center scrape complete")
 
 if __name__ == "__main__":
     run_helpcenter_scrape()
@@ -0,0 +1,62 @@
+"""Host affinity and circuit breaking for services reachable on several hosts."""
+import threading
+import time
+
+
+class HostHealth:
+    """Tracks which of several equivalent hosts to try first.
+
+    The host that last answered is tried first. After ``failure_threshold``
+    consecutive failures a host's circuit opens and it is skipped for
+    ``cooldown`` seconds; once the cooldown passes it gets one trial request
+    (half-open) and a single failure reopens it.
+    """
+
+    def __init__(self, hosts, failure_threshold=2, cooldown=300):
+        self.hosts = tuple(hosts)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._preferred = self.hosts[0] if self.hosts else None
+        self._failures = {h: 0 for h in self.hosts}
+        self._open_until = {h: 0.0 for h in self.hosts}
+        self._lock = threading.Lock()
+
+    def is_open(self, host):
+        with self._lock:
+            return self._open_until.get(host, 0.0) > time.monotonic()
+
+    def ordered(self):
+        """Return the hosts to try, preferred first and open circuits left out.
+
+        While every circuit is open the list is empty, so callers go straight
+        to their fallback until a cooldown ends and that host gets its
+        half-open trial request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            closed = [h for h in self.hosts if self._open_until[h] <= now]
+            if self._preferred in closed:
+                closed.remove(self._preferred)
+                closed.insert(0, self._preferred)
+            return closed
+
+    def record_success(self, host):
+        with self._lock:
+            if host not in self._failures:
+                return
+            self._failures[host] = 0
+            self._open_until[host] = 0.0
+            self._preferred = host
+
+    def record_failure(self, host):
+        with self._lock:
+            if host not in self._failures:
+                return
+            self._failures[host] += 1
+            if self._failures[host] >= self.failure_threshold:
+                self._open_until[host] = time.monotonic() + self.cooldown
+                # Half-open after the cooldown: one more failure reopens it.
+                self._failures[host] = self.failure_threshold - 1
+                if self._preferred == host:
+                    others = [h for h in self.hosts if h != host]
+                    self._preferred = others[0] if others else host
@@ -0,0 +1,54 @@
+"""Pluggable HTML parser backend for the extractors.
+
+Every extractor keeps using the BeautifulSoup API (``find``, ``select``,
+``get_text``); only the tree builder underneath is swapped. The C-backed
+``lxml`` builder is used when installed, otherwise the pure-Python
+``html.parser`` that ships with Python.
+
+Both builders give the same extraction results on well-formed pages; they
+only disagree on how to repair broken markup (e.g. an unclosed ``<p>``
+followed by a block element), where lxml follows the HTML spec.
+"""
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HAVE_LXML = True
+except ImportError:  # pragma: no cover - optional dependency
+    HAVE_LXML = False
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+FALLBACK = "html.parser"
+
+# "auto" picks the fastest installed backend; "lxml" / "html.parser" force one.
+BACKEND = getattr(config, "HTML_PARSER", "auto")
+
+
+def available_backends():
+    return ["lxml", FALLBACK] if HAVE_LXML else [FALLBACK]
+
+
+def backend_name(name=None):
+    """Resolve ``name`` (or the configured backend) to an installed builder."""
+    name = name or BACKEND
+    if name == "auto":
+        return "lxml" if HAVE_LXML else FALLBACK
+    if name not in available_backends():
+        return FALLBACK
+    return name
+
+
+def make_soup(markup, parser=None):
+    """Parse ``markup`` (str or bytes) with the selected backend."""
+    return BeautifulSoup(markup, backend_name(parser))
+
+
+def html_to_text(markup, separator=" ", parser=None):
+    """Return the stripped text of an HTML fragment, joined by ``separator``."""
+    if not markup:
+        return ""
+    return make_soup(markup, parser).get_text(separator, strip=True)
@@ -0,0 +1,247 @@
+"""Persistent conditional-request cache (ETag / Last-Modified) on top of http_client."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import http_client, urls
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+# =======================
+# SETTINGS
+# =======================
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "data", "http_cache")
+ENABLED = getattr(config, "HTTP_CACHE_ENABLED", True)
+# Entries not used (stored or replayed) for this long are evicted, then the
+# least recently used ones until the cache fits MAX_BYTES.
+MAX_AGE_DAYS = getattr(config, "HTTP_CACHE_MAX_AGE_DAYS", 30)
+MAX_BYTES = getattr(config, "HTTP_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+
+# Response headers worth replaying when a 304 is served from disk.
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Content-Language")
+
+
+# =======================
+# KEYS & FILES
+# =======================
+def canonical_url(url):
+    """Cache key spelling of ``url`` (see ``urls.canonicalize``)."""
+    return urls.canonicalize(url)
+
+
+def _paths(url, head_only=False):
+    # Head-only prefixes are cached apart from full bodies of the same URL.
+    variant = " head" if head_only else ""
+    key = hashlib.sha256((canonical_url(url) + variant).encode("utf-8")).hexdigest()
+    folder = os.path.join(CACHE_DIR, key[:2])
+    return os.path.join(folder, f"{key}.json"), os.path.join(folder, f"{key}.body")
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load_entry(url, head_only=False):
+    """Return the stored metadata for ``url`` or ``None``."""
+    meta_path, _ = _paths(url, head_only)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_entry(url, entry, head_only=False):
+    meta_path, _ = _paths(url, head_only)
+    _atomic_write(meta_path, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def _load_body(url, head_only=False):
+    _, body_path = _paths(url, head_only)
+    try:
+        with open(body_path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def store(url, response, body=None, head_only=False):
+    """Persist validators and body of a 200 response (no-op without validators)."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return
+    _, body_path = _paths(url, head_only)
+    _atomic_write(body_path, response.content if body is None else body)
+    _save_entry(url, {
+        "url": canonical_url(url),
+        "etag": etag or "",
+        "last_modified": last_modified or "",
+        "headers": {h: response.headers[h] for h in _STORED_HEADERS if h in response.headers},
+        "parsed": {},
+    }, head_only)
+
+
+# =======================
+# EVICTION
+# =======================
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+def _touch(url, head_only=False):
+    meta_path, _ = _paths(url, head_only)
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+
+def prune(max_age_days=None, max_bytes=None):
+    """Evict stale entries, then the least recently used until under ``max_bytes``.
+
+    An entry's age is the mtime of its metadata file, refreshed whenever it
+    is stored or replayed. Returns the number of entries removed.
+    """
+    max_age_days = MAX_AGE_DAYS if max_age_days is None else max_age_days
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries = []  # (last used, size, files)
+    for folder, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(folder, name)
+            body_path = meta_path[:-len(".json")] + ".body"
+            try:
+                used = os.path.getmtime(meta_path)
+                size = os.path.getsize(meta_path) + (os.path.getsize(body_path) if os.path.exists(body_path) else 0)
+            except OSError:
+                continue
+            entries.append((used, size, (meta_path, body_path)))
+    entries.sort()
+    cutoff = time.time() - max_age_days * 24 * 3600
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for used, size, files in entries:
+        if used >= cutoff and total <= max_bytes:
+            break
+        for path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def _prune_once():
+    """Run ``prune`` on the first cached request of the process."""
+    global _pruned
+    with _prune_lock:
+        if _pruned:
+            return
+        _pruned = True
+    removed = prune()
+    if removed:
+        print(f"🧹 Evicted {removed} stale HTTP cache entr{'y' if removed == 1 else 'ies'}.")
+
+
+# =======================
+# PARSED RESULTS
+# =======================
+def load_parsed(url, name, head_only=False):
+    """Return a parsed result stored for the current cached body, if any."""
+    entry = load_entry(url, head_only)
+    if not entry:
+        return None
+    return entry.get("parsed", {}).get(name)
+
+
+def store_parsed(url, name, value, head_only=False):
+    """Attach a JSON-serialisable parsed result to the cached body."""
+    entry = load_entry(url, head_only)
+    if not entry:
+        return
+    entry.setdefault("parsed", {})[name] = value
+    _save_entry(url, entry, head_only)
+
+
+# =======================
+# REQUESTS
+# =======================
+def conditional_headers(url, headers=None, head_only=False):
+    """Return ``headers`` plus If-None-Match / If-Modified-Since for ``url``."""
+    merged = dict(headers or {})
+    entry = load_entry(url, head_only) if ENABLED else None
+    if entry:
+        if entry.get("etag"):
+            merged["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            merged["If-Modified-Since"] = entry["last_modified"]
+    return merged
+
+
+def replay(url, response, head_only=False):
+    """Turn a 304 into a 200 response carrying the cached body.
+
+    Returns ``None`` when the body is no longer on disk, in which case the
+    caller should refetch without validators.
+    """
+    entry = load_entry(url, head_only)
+    body = _load_body(url, head_only)
+    if entry is None or body is None:
+        return None
+    cached = requests.models.Response()
+    cached.status_code = 200
+    cached._content = body
+    cached.headers = CaseInsensitiveDict(entry.get("headers", {}))
+    cached.url = response.url or url
+    cached.request = response.request
+    content_type = cached.headers.get("Content-Type", "").lower()
+    cached.encoding = requests.utils.get_encoding_from_headers(cached.headers) if "charset=" in content_type else http_client.sniff_charset(body)
+    cached.from_cache = True
+    cached.head_only = head_only
+    _touch(url, head_only)
+    return cached
+
+
+def get(url, headers=None, timeout=None, head_only=False, **kwargs):
+    """GET through the shared client, revalidating against the disk cache.
+
+    The returned response carries ``from_cache``: ``True`` when the server
+    answered 304 and the body was replayed from disk, ``False`` otherwise.
+    ``head_only`` fetches with ``http_client.get_head`` and caches that
+    prefix separately from full bodies.
+    """
+    fetch = http_client.get_head if head_only else http_client.get
+    if not ENABLED:
+        response = fetch(url, headers=headers, timeout=timeout, **kwargs)
+        response.from_cache = False
+        return response
+
+    _prune_once()
+    response = fetch(url, headers=conditional_headers(url, headers, head_only), timeout=timeout, **kwargs)
+    if response.status_code == 304:
+        cached = replay(url, response, head_only)
+        if cached is not None:
+            return cached
+        response = fetch(url, headers=headers, timeout=timeout, **kwargs)
+    response.from_cache = False
+    if response.status_code == 200:
+        store(url, response, head_only=head_only)
+    return response
@@ -0,0 +1,179 @@
+"""Shared pooled HTTP client used by every scraper module."""
+import codecs
+import re
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import rate_limit
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+# =======================
+# SETTINGS
+# =======================
+POOL_CONNECTIONS = getattr(config, "HTTP_POOL_CONNECTIONS", 20)  # number of hosts kept alive
+POOL_MAXSIZE = getattr(config, "HTTP_POOL_MAXSIZE", 10)  # connections kept per host
+DEFAULT_TIMEOUT = getattr(config, "HTTP_TIMEOUT", 20)
+HEAD_MAX_BYTES = getattr(config, "HTTP_HEAD_MAX_BYTES", 128 * 1024)  # cap for get_head
+HEAD_CHUNK_SIZE = 8 * 1024
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/124.0.0.0 Safari/537.36"
+)
+
+# =======================
+# HEADER PROFILES
+# =======================
+BASE_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+HTML_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Referer": "https://www.google.com/",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "DNT": "1",
+}
+
+JSON_HEADERS = {
+    "Accept": "application/json",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+_session = None
+
+
+# =======================
+# SESSION
+# =======================
+def _build_session():
+    session = requests.Session()
+    # One adapter keeps a keep-alive pool per host; retries stay with the callers.
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(BASE_HEADERS)
+    return session
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = _build_session()
+    return _session
+
+
+def configure(pool_connections=None, pool_maxsize=None, timeout=None):
+    """Resize the connection pools and/or default timeout for this process."""
+    global POOL_CONNECTIONS, POOL_MAXSIZE, DEFAULT_TIMEOUT, _session
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    if timeout is not None:
+        DEFAULT_TIMEOUT = timeout
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def host_of(url):
+    """Return the lowercased host of a URL."""
+    return urlparse(url).netloc.lower()
+
+
+# =======================
+# REQUESTS
+# =======================
+def request(method, url, headers=None, timeout=None, **kwargs):
+    """Send a request through the shared session.
+
+    ``headers`` are merged over the session defaults, so callers only pass
+    the profile they need (``HTML_HEADERS``, ``JSON_HEADERS``) plus extras.
+    Every request waits on the host's limiter and reports its outcome back,
+    so 429s and Retry-After slow down all callers of that host.
+    """
+    lim = rate_limit.limiter(host_of(url))
+    lim.acquire()
+    try:
+        response = get_session().request(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout or DEFAULT_TIMEOUT,
+            **kwargs,
+        )
+    except Exception:
+        lim.release(error=True)
+        raise
+    lim.observe(response)
+    return response
+
+
+def get(url, headers=None, timeout=None, **kwargs):
+    kwargs.setdefault("allow_redirects", True)
+    return request("GET", url, headers=headers, timeout=timeout, **kwargs)
+
+
+def head(url, headers=None, timeout=None, **kwargs):
+    kwargs.setdefault("allow_redirects", True)
+    return request("HEAD", url, headers=headers, timeout=timeout, **kwargs)
+
+
+# <meta charset="x"> and <meta http-equiv="Content-Type" content="text/html; charset=x">
+META_CHARSET_RE = re.compile(rb"""<meta[^>]*?charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+
+
+def sniff_charset(content, default="utf-8"):
+    """Encoding declared by a ``<meta>`` tag in ``content`` (bytes), else ``default``."""
+    match = META_CHARSET_RE.search(content)
+    if match:
+        name = match.group(1).decode("ascii")
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return default
+
+
+def get_head(url, headers=None, timeout=None, max_bytes=None, **kwargs):
+    """GET a page but only read its body up to ``</head>``.
+
+    The body is streamed and the connection closed as soon as the closing
+    head tag arrives or ``max_bytes`` have been read. The returned response
+    carries just that prefix in ``content``/``text`` and ``head_only=True``.
+    Without a charset in the Content-Type header the prefix is decoded with
+    the one its ``<meta>`` tags declare, falling back to UTF-8.
+    """
+    max_bytes = max_bytes or HEAD_MAX_BYTES
+    kwargs.setdefault("allow_redirects", True)
+    response = request("GET", url, headers=headers, timeout=timeout, stream=True, **kwargs)
+    buf = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=HEAD_CHUNK_SIZE):
+            # Look a few bytes back so a tag split across chunks is still found.
+            start = max(0, len(buf) - 6)
+            buf.extend(chunk)
+            if buf[start:].lower().find(b"</head") != -1:
+                break
+            if len(buf) >= max_bytes:
+                break
+    finally:
+        response.close()
+    response._content = bytes(buf[:max_bytes])
+    response._content_consumed = True
+    if "charset=" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = sniff_charset(response._content)
+    response.head_only = True
+    return response
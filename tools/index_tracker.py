@@ -10,12 +10,14 @@ TRACK_JSON = 'output/geo_index_tracking.json'
 def start_tracking(subreddits, count):
     reddit = reddit_search.get_reddit()
     existing = storage.load_csv(TRACK_CSV)
+    # One row per post: link posts to the same page are tracked separately.
     existing_ids = {row['post_id'] for row in existing}
     rows = []
     for sub in subreddits:
         for submission in reddit.subreddit(sub).new(limit=count):
             if submission.id in existing_ids:
                 continue
+            existing_ids.add(submission.id)
             rows.append({
                 'post_id': submission.id,
                 'url': submission.url,
@@ -0,0 +1,186 @@
+"""Compiled multi-keyword matcher shared by every keyword counter in the tools.
+
+``KeywordMatcher`` is built once per keyword set. Large sets (more than
+``SCAN_THRESHOLD`` patterns) get an Aho–Corasick automaton that counts or
+detects every keyword in a single pass over the text; smaller sets keep
+one C-level scan per keyword, which is faster at that size.
+
+Counts follow ``str.count`` semantics per keyword (non-overlapping,
+left to right), so results are identical to the per-keyword loops this
+replaces; matches of *different* keywords may overlap ("Ledger" and
+"Ledger Live" both count in "Ledger Live").
+"""
+import re
+from collections import deque
+from functools import lru_cache
+
+# Up to this many distinct patterns one C-level str.count / ``in`` (or one
+# compiled regex, for word boundaries) per pattern beats the pure-Python
+# automaton walk: on ~20 KB of text the scan is ~2x faster at 200 patterns
+# and about even at 500; only larger sets use the automaton.
+SCAN_THRESHOLD = 500
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Counts / detects a fixed set of keywords in one pass over a text.
+
+    ``case_fold`` lowercases keywords and text before matching (the
+    behaviour of the former ``kw.lower() in text.lower()`` checks).
+    ``word_boundary`` only accepts matches not surrounded by word
+    characters, so "hack" no longer matches inside "hackathon".
+    """
+
+    def __init__(self, keywords, word_boundary=False, case_fold=True):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.word_boundary = word_boundary
+        self.case_fold = case_fold
+
+        # Several keywords can normalise to one pattern ("Device", "device").
+        self._patterns = []
+        self._pattern_keywords = []
+        by_pattern = {}
+        for kw in self.keywords:
+            pattern = self._normalize(kw)
+            if not pattern:
+                continue
+            if pattern not in by_pattern:
+                by_pattern[pattern] = len(self._patterns)
+                self._patterns.append(pattern)
+                self._pattern_keywords.append([])
+            self._pattern_keywords[by_pattern[pattern]].append(kw)
+
+        self._use_automaton = len(self._patterns) > SCAN_THRESHOLD
+        self._regexes = None
+        if self._use_automaton:
+            self._build()
+        elif word_boundary:
+            # ``\w`` is exactly ``_is_word_char`` for str patterns.
+            self._regexes = [re.compile(r"(?<!\w)" + re.escape(p) + r"(?!\w)") for p in self._patterns]
+
+    def _normalize(self, text):
+        return text.lower() if self.case_fold else text
+
+    # =======================
+    # AUTOMATON
+    # =======================
+    def _build(self):
+        goto = [{}]
+        out = [[]]
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._lengths = [len(p) for p in self._patterns]
+
+    def _iter_matches(self, text):
+        """Yield ``(pattern_id, start, end)`` for every match, ordered by end."""
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        boundary = self.word_boundary
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for pid in out[state]:
+                start = end - lengths[pid]
+                if boundary and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < n and _is_word_char(text[end]))
+                ):
+                    continue
+                yield pid, start, end
+
+    def _pattern_counts(self, text):
+        counts = [0] * len(self._patterns)
+        if self._use_automaton:
+            last_end = [0] * len(self._patterns)
+            for pid, start, end in self._iter_matches(text):
+                # Non-overlapping per pattern, exactly like str.count.
+                if start >= last_end[pid]:
+                    counts[pid] += 1
+                    last_end[pid] = end
+        elif self._regexes is not None:
+            for pid, regex in enumerate(self._regexes):
+                counts[pid] = len(regex.findall(text))
+        else:
+            for pid, pattern in enumerate(self._patterns):
+                counts[pid] = text.count(pattern)
+        return counts
+
+    def _pattern_hits(self, text):
+        if self._regexes is not None:
+            return {pid for pid, regex in enumerate(self._regexes) if regex.search(text)}
+        if not self._use_automaton:
+            return {pid for pid, pattern in enumerate(self._patterns) if pattern in text}
+        hits = set()
+        total = len(self._patterns)
+        for pid, _, _ in self._iter_matches(text):
+            hits.add(pid)
+            if len(hits) == total:
+                break
+        return hits
+
+    # =======================
+    # PUBLIC API
+    # =======================
+    def count(self, text):
+        """Return ``{keyword: occurrences}`` for every keyword."""
+        counts = self._pattern_counts(self._normalize(text or ""))
+        result = {kw: 0 for kw in self.keywords}
+        for pid, n in enumerate(counts):
+            for kw in self._pattern_keywords[pid]:
+                result[kw] = n
+        return result
+
+    def found(self, text):
+        """Return the set of keywords present in ``text``."""
+        if not text or not self._patterns:
+            return set()
+        hits = self._pattern_hits(self._normalize(text))
+        return {kw for pid in hits for kw in self._pattern_keywords[pid]}
+
+    def first(self, text):
+        """Return the first keyword (in keyword-list order) present in ``text``."""
+        found = self.found(text)
+        return next((kw for kw in self.keywords if kw in found), None)
+
+
+@lru_cache(maxsize=64)
+def _cached(keywords, word_boundary, case_fold):
+    return KeywordMatcher(keywords, word_boundary=word_boundary, case_fold=case_fold)
+
+
+def matcher_for(keywords, word_boundary=False, case_fold=True):
+    """Return a shared compiled matcher for ``keywords`` (built once per set)."""
+    return _cached(tuple(keywords or ()), word_boundary, case_fold)
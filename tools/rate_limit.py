@@ -0,0 +1,201 @@
+"""Per-host / per-API rate limiting: token buckets, Retry-After and AIMD concurrency."""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+# =======================
+# SETTINGS
+# =======================
+# rate: sustained requests per second, burst: bucket size,
+# max_concurrency: ceiling for the AIMD in-flight limit.
+DEFAULT_LIMIT = {"rate": 1.0, "burst": 1, "max_concurrency": 4}
+
+LIMITS = {
+    "support.ledger.com": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+    "ledger.zendesk.com": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+    "www.ledger.com": {"rate": 2.0, "burst": 4, "max_concurrency": 4},
+    "www.googleapis.com": {"rate": 1.0, "burst": 1, "max_concurrency": 1},
+    "youtube": {"rate": 5.0, "burst": 5, "max_concurrency": 4},
+    "reddit": {"rate": 100 / 60, "burst": 10, "max_concurrency": 4},
+}
+LIMITS.update(getattr(config, "RATE_LIMITS", {}))
+
+MAX_BACKOFF = 60.0  # seconds, cap for 429s without Retry-After and for errors
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds encoded by a Retry-After header, or ``None``."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# =======================
+# TOKEN BUCKET
+# =======================
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations.
+
+    ``reserve`` always takes a token and returns how long the caller must wait
+    for it, so concurrent callers queue up behind each other instead of
+    polling. ``pause`` moves the start of the token timeline past a deadline
+    and empties the bucket, so callers after a pause stay spaced at
+    ``1 / rate`` instead of all firing when it ends.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()  # in the future while paused
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            ready = self._updated + max(0.0, -self._tokens) / self.rate
+            return max(0.0, ready - now)
+
+    def pause(self, seconds):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            until = now + seconds
+            if until > self._updated:
+                self._updated = until
+                self._tokens = min(self._tokens, 0.0)
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# =======================
+# AIMD CONCURRENCY
+# =======================
+class AdaptiveConcurrency:
+    """In-flight limit that grows by one per window of successes and halves on throttling."""
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self._in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+# =======================
+# LIMITER
+# =======================
+class Limiter:
+    """Token bucket + AIMD concurrency for one host or API."""
+
+    def __init__(self, key, rate, burst, max_concurrency):
+        self.key = key
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self._strikes = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a concurrency slot and a token, blocking only as long as needed."""
+        self.concurrency.acquire()
+        self.bucket.acquire()
+
+    def release(self, status=None, retry_after=None, error=False):
+        """Return the slot and feed the outcome back into the limits."""
+        throttled = status == 429 or (status == 503 and retry_after is not None)
+        self.concurrency.release(throttled=throttled or error)
+        with self._lock:
+            if throttled or error:
+                self._strikes += 1
+                delay = retry_after if retry_after is not None else min(MAX_BACKOFF, 2 ** self._strikes)
+                self.bucket.pause(delay)
+            else:
+                self._strikes = 0
+
+    def observe(self, response):
+        self.release(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+
+    def sync_budget(self, remaining, reset_in):
+        """Spread the ``remaining`` requests an API reports over its reset window."""
+        reset_in = max(float(reset_in), 1.0)
+        if remaining < 1:
+            self.bucket.pause(reset_in)
+        self.bucket.set_rate(max(float(remaining), 1.0) / reset_in)
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def limiter(key):
+    """Return the shared limiter for ``key`` (a host name or API label)."""
+    with _registry_lock:
+        lim = _limiters.get(key)
+        if lim is None:
+            settings = {**DEFAULT_LIMIT, **LIMITS.get(key, {})}
+            lim = Limiter(key, settings["rate"], settings["burst"], settings["max_concurrency"])
+            _limiters[key] = lim
+        return lim
+
+
+def acquire(key):
+    """Wait for budget on ``key`` without holding a concurrency slot.
+
+    Used by API clients we do not send requests for ourselves (PRAW, the
+    YouTube client), where only the request rate can be governed.
+    """
+    return limiter(key).bucket.acquire()
+
+
+def pause(key, seconds):
+    """Hold back every caller of ``key`` for ``seconds`` (e.g. after a 429)."""
+    limiter(key).bucket.pause(seconds)
+
+
+def sync_budget(key, remaining, reset_in):
+    """Pace ``key`` by a server-reported budget (e.g. ``X-Ratelimit-Remaining``)."""
+    limiter(key).sync_budget(remaining, reset_in)
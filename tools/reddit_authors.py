@@ -0,0 +1,135 @@
+"""Cached, batch-hydrated Reddit author info.
+
+Reading ``karma`` or ``created_utc`` from a PRAW ``Redditor`` costs one
+``/user/<name>/about`` request per author and per post. ``AuthorCache``
+keeps author info keyed by name in ``data/reddit_authors.json`` for
+``REDDIT_AUTHOR_TTL_DAYS`` and hydrates cache misses up to 100 at a time
+through Reddit's ``/api/user_data_by_account_ids`` endpoint, using the
+``author_fullname`` every listing already includes.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from . import rate_limit
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+# =======================
+# SETTINGS
+# =======================
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, "data", "reddit_authors.json")
+TTL_DAYS = getattr(config, "REDDIT_AUTHOR_TTL_DAYS", 7)
+
+USER_DATA_PATH = "/api/user_data_by_account_ids"
+BATCH_SIZE = 100  # account ids per user-data request
+
+MISSING = {'name': 'N/A', 'flair': 'N/A', 'karma': 'N/A', 'created': 'N/A'}
+
+
+def author_fullname(submission):
+    """``t2_`` id of the post author from the listing data, without a fetch."""
+    # vars(): getattr on an unfetched PRAW object would trigger a request.
+    return vars(submission).get("author_fullname")
+
+
+class AuthorCache:
+    """Author name -> ``{fullname, karma, created_utc, fetched}``, persisted as JSON.
+
+    Entries older than ``ttl_days`` are refreshed on the next ``hydrate``.
+    Accounts the batch endpoint does not return (suspended or deleted) are
+    cached with ``karma`` ``None`` so they are not asked for again.
+    """
+
+    def __init__(self, path=CACHE_FILE, ttl_days=TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _fresh(self, name):
+        entry = self._entries.get(name)
+        return entry is not None and time.time() - entry.get("fetched", 0) < self.ttl
+
+    def _put(self, name, fullname, karma=None, created_utc=None):
+        self._entries[name] = {
+            "fullname": fullname,
+            "karma": karma,
+            "created_utc": created_utc,
+            "fetched": time.time(),
+        }
+        self._dirty = True
+
+    def hydrate(self, client, submissions):
+        """Fetch every author of ``submissions`` missing from the cache in bulk."""
+        wanted = {}
+        with self._lock:
+            for submission in submissions:
+                fullname = author_fullname(submission)
+                if submission.author is None or not fullname:
+                    continue
+                name = submission.author.name
+                if not self._fresh(name):
+                    wanted[fullname] = name
+        ids = list(wanted)
+        for i in range(0, len(ids), BATCH_SIZE):
+            batch = ids[i:i + BATCH_SIZE]
+            rate_limit.acquire("reddit")
+            try:
+                data = client.request(method="GET", path=USER_DATA_PATH, params={"ids": ",".join(batch)})
+            except Exception as e:
+                print(f"  Skipped author data for {len(batch)} author(s) due to error: {e}")
+                continue
+            with self._lock:
+                for fullname in batch:
+                    user = (data or {}).get(fullname) or {}
+                    karma = None
+                    if "link_karma" in user or "comment_karma" in user:
+                        karma = user.get("link_karma", 0) + user.get("comment_karma", 0)
+                    self._put(user.get("name") or wanted[fullname], fullname, karma, user.get("created_utc"))
+
+    def info(self, submission):
+        """Author row fields for ``submission``; only the cache is consulted."""
+        if submission.author is None:
+            return dict(MISSING)
+        name = submission.author.name
+        flair = vars(submission).get("author_flair_text") or 'N/A'
+        with self._lock:
+            entry = self._entries.get(name) or {}
+        karma = entry.get("karma")
+        created = entry.get("created_utc")
+        return {
+            'name': name,
+            'flair': flair,
+            'karma': karma if karma is not None else 'N/A',
+            'created': pd.to_datetime(created, unit='s') if created else 'N/A',
+        }
+
+    def save(self):
+        """Write the cache to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._entries, ensure_ascii=False)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, self.path)
@@ -2,9 +2,12 @@ import praw
 import pandas as pd
 import json
 import config
-import prawcore
 import datetime
+import queue
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import checkpoint, keyword_matcher, rate_limit, reddit_authors, row_writer, storage
 
 
 def init_reddit_client():
@@ -44,42 +47,147 @@ def format_top_comments(comments):
     return "\n".join(formatted)
 
 
-def get_author_info(author):
+COMMENT_WORKERS = getattr(config, "REDDIT_COMMENT_WORKERS", 4)
+
+
+def sync_rate_budget(client):
+    """Pace the shared "reddit" limiter by the budget in Reddit's X-Ratelimit-* headers.
+
+    PRAW records the latest headers in ``client.auth.limits``; before the
+    first request they are unknown and the configured rate applies.
+    Returns the remaining request count, or ``None`` when unknown.
+    """
+    limits = getattr(getattr(client, "auth", None), "limits", None) or {}
+    remaining, reset_ts = limits.get("remaining"), limits.get("reset_timestamp")
+    if remaining is None or reset_ts is None:
+        return None
+    rate_limit.sync_budget("reddit", remaining, reset_ts - time.time())
+    return remaining
+
+
+# PRAW instances are not thread-safe (one session, token and rate-limit
+# state each), so every comment worker borrows a client of its own.
+_comment_clients = queue.Queue()
+
+
+def _borrow_comment_client():
+    try:
+        return _comment_clients.get_nowait()
+    except queue.Empty:
+        return init_reddit_client()
+
+
+def _comments_task(submission):
+    worker = _borrow_comment_client()
+    limiter = rate_limit.limiter("reddit")
+    limiter.acquire()
+    status = None
     try:
-        if author is None:
-            return {'name': 'N/A', 'flair': 'N/A', 'karma': 'N/A', 'created': 'N/A'}
-        author_info = {
-            'name': author.name if hasattr(author, 'name') else 'N/A',
-            'flair': author.flair if hasattr(author, 'flair') else 'N/A',
-            'karma': (author.link_karma + author.comment_karma) if hasattr(author, 'link_karma') and hasattr(author, 'comment_karma') else 'N/A',
-            'created': pd.to_datetime(author.created_utc, unit='s') if hasattr(author, 'created_utc') else 'N/A'
-        }
-    except (AttributeError, prawcore.exceptions.NotFound):
-        author_info = {'name': 'N/A', 'flair': 'N/A', 'karma': 'N/A', 'created': 'N/A'}
+        # A fresh lazy Submission bound to this worker's client; the listing's
+        # Submission belongs to the caller's client and must not load here.
+        return format_top_comments(fetch_top_comments(worker.submission(id=submission.id)))
+    except Exception as e:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        print(f"  Skipped comments for post {submission.id} due to error: {e}")
+        return ""
+    finally:
+        limiter.release(status)
+        sync_rate_budget(worker)
+        _comment_clients.put(worker)
+
+
+def fetch_comments_concurrently(client, submissions, workers=COMMENT_WORKERS):
+    """Return ``{submission id: formatted top comments}`` fetched by a worker pool.
+
+    Each worker uses its own Reddit client (kept for reuse across batches),
+    so ``client`` is only read for the current rate budget. The pool is
+    capped by ``workers`` and by the remaining budget; the shared "reddit"
+    limiter paces the requests themselves.
+    """
+    if not submissions:
+        return {}
+    remaining = sync_rate_budget(client)
+    if remaining is not None:
+        workers = min(workers, max(1, int(remaining)))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(submissions)))) as pool:
+        futures = {s.id: pool.submit(_comments_task, s) for s in submissions}
+        return {sub_id: future.result() for sub_id, future in futures.items()}
+
+
+def get_author_info(submission, authors=None):
+    """Author fields for ``submission``.
+
+    With ``authors`` (a ``reddit_authors.AuthorCache`` hydrated beforehand)
+    karma and account age come from the cache; without it only the name,
+    which the listing already carries, is filled in and no request is made.
+    """
+    if authors is not None:
+        return authors.info(submission)
+    author_info = dict(reddit_authors.MISSING)
+    if submission.author is not None:
+        author_info['name'] = submission.author.name
     return author_info
 
 
 def highlight_keywords(text, keywords):
     if not keywords or not text:
         return []
-    text_lower = text.lower()
-    return list({kw for kw in keywords if kw.lower() in text_lower})
+    return list(keyword_matcher.matcher_for(keywords).found(text))
+
+
+class ScanStats:
+    """Running totals for the scan summary, updated one row at a time."""
+
+    def __init__(self):
+        self.posts = self.upvotes = self.comments = 0
+        self.flagged_posts = self.flagged_upvotes = self.flagged_comments = 0
+        self.first = self.last = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        stats = cls()
+        for row in rows:
+            stats.add(row)
+        return stats
+
+    def add(self, row):
+        # Rows read back from a CSV carry strings; count them the same way.
+        upvotes = int(float(row.get('upvotes') or 0))
+        comments = int(float(row.get('# of comments') or 0))
+        created = pd.to_datetime(row.get('created'), errors='coerce')
+        flagged = row.get('highlighted_keywords')
+        if isinstance(flagged, str):
+            flagged = flagged not in ('', '[]')
+
+        self.posts += 1
+        self.upvotes += upvotes
+        self.comments += comments
+        if flagged:
+            self.flagged_posts += 1
+            self.flagged_upvotes += upvotes
+            self.flagged_comments += comments
+        if not pd.isna(created):
+            self.first = created if self.first is None else min(self.first, created)
+            self.last = created if self.last is None else max(self.last, created)
 
 
 def summarize_scan(df, subreddit, start_str, end_str, highlight_terms, summary_path=None):
-    total_posts = len(df)
-    total_upvotes = df['upvotes'].sum()
-    total_comments = df['# of comments'].sum()
-    date_range = pd.to_datetime(df['created'])
-    days = max((date_range.max() - date_range.min()).days, 1)
+    stats = ScanStats.from_rows(df.to_dict('records'))
+    return write_scan_summary(stats, subreddit, start_str, end_str, summary_path)
+
+
+def write_scan_summary(stats, subreddit, start_str, end_str, summary_path=None):
+    total_posts = stats.posts
+    total_upvotes = stats.upvotes
+    total_comments = stats.comments
+    days = max((stats.last - stats.first).days, 1) if stats.first is not None else 1
     posts_per_day = total_posts / days
     upvotes_per_post = total_upvotes / total_posts if total_posts else 0
     comments_per_post = total_comments / total_posts if total_posts else 0
 
-    flagged_df = df[df['highlighted_keywords'].apply(lambda x: bool(x))]
-    flagged_posts = len(flagged_df)
-    flagged_upvotes = flagged_df['upvotes'].sum()
-    flagged_comments = flagged_df['# of comments'].sum()
+    flagged_posts = stats.flagged_posts
+    flagged_upvotes = stats.flagged_upvotes
+    flagged_comments = stats.flagged_comments
     flagged_posts_per_day = flagged_posts / days if days else 0
     flagged_upvotes_per_post = flagged_upvotes / flagged_posts if flagged_posts else 0
     flagged_comments_per_post = flagged_comments / flagged_posts if flagged_posts else 0
@@ -108,78 +216,278 @@ Average Comments Per Flagged Post: {flagged_comments_per_post:.2f}
     if summary_path:
         with open(summary_path, 'w') as f:
             f.write(summary)
-
-
-def search_all_subreddit_posts(client, subreddit='all', limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True):
-    results = {}
-    print(f"  Scanning subreddit '{subreddit}' with {'no limit' if limit is None else f'limit={limit}'}...")
+    return summary
+
+
+SEARCH_QUERY_MAX_LEN = 512  # Reddit rejects longer search queries
+STREAM_PROGRESS_EVERY = 100  # rows between progress messages when streaming
+
+
+def _post_row(submission, search_term, post_type, highlight_terms, formatted_comments="", authors=None):
+    author_info = get_author_info(submission, authors)
+
+    tags = set()
+    for field in [submission.title, submission.selftext, formatted_comments]:
+        tags.update(highlight_keywords(field, highlight_terms))
+
+    return {
+        'id': submission.id,
+        'search term': search_term,
+        'type': post_type,
+        'title': submission.title,
+        'upvotes': submission.ups,
+        '# of comments': submission.num_comments,
+        'author': author_info['name'],
+        'author karma': author_info['karma'],
+        'author created': author_info['created'],
+        'author flair': author_info['flair'],
+        'created': pd.to_datetime(submission.created_utc, unit='s'),
+        'url': submission.url,
+        'content': submission.selftext,
+        'flair': submission.link_flair_text,
+        'subreddit': submission.subreddit.display_name,
+        'top comments': formatted_comments,
+        'highlighted_keywords': list(tags)
+    }
+
+
+def _collect(client, submissions, tag, post_type, limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, journal=None, authors=None, seen=None, journal_rows=True, skip=None):
+    """Yield a row for every newest-first submission that ``tag`` accepts.
+
+    ``tag(submission)`` returns the 'search term' for the row, or ``None`` to
+    skip the post before any author or comment request is made. Accepted
+    posts are queued; each batch has its authors hydrated in one request
+    (with ``authors``) and its top comments fetched concurrently, then its
+    rows are yielded. A post is journalled only after its row has been
+    consumed, so a journalled post is never missing from the output.
+    ``journal_rows=False`` journals IDs only and skips journalled posts
+    instead of yielding them again (their rows were already written out).
+    ``seen`` deduplicates across several listings. Posts in ``skip`` (IDs
+    already written out) are passed over but count towards ``limit``, which
+    stops the walk after that many posts.
+    """
+    pending = []
     count = 0
-    for submission in client.subreddit(subreddit).new(limit=None):
+
+    def drain():
+        submissions = [submission for submission, _ in pending]
+        if authors is not None:
+            authors.hydrate(client, submissions)
+        comments = fetch_comments_concurrently(client, submissions) if fetch_comments else {}
+        for submission, term in pending:
+            row = _post_row(submission, term, post_type, highlight_terms, comments.get(submission.id, ""), authors)
+            yield row
+            if journal is not None:
+                journal.record(submission.id, row if journal_rows else None)
+        pending.clear()
+
+    for submission in submissions:
         if end_ts and submission.created_utc > end_ts:
             continue
         if start_ts and submission.created_utc < start_ts:
             break  # Stop once posts get older than the start date
 
         sub_id = submission.id
-        if sub_id in results:
+        if seen is not None and sub_id in seen:
             continue
 
-        author_info = get_author_info(submission.author)
-
-        top_comments = []
-        formatted_comments = ""
-        if fetch_comments:
-            time.sleep(1)  # prevent 429 rate limit
-            try:
-                top_comments = fetch_top_comments(submission)
-                formatted_comments = format_top_comments(top_comments)
-            except Exception as e:
-                print(f"  Skipped comments for post {sub_id} due to error: {e}")
-
-        tags = set()
-        for field in [submission.title, submission.selftext, formatted_comments]:
-            tags.update(highlight_keywords(field, highlight_terms))
-
-        results[sub_id] = {
-            'search term': 'ALL',
-            'type': 'new',
-            'title': submission.title,
-            'upvotes': submission.ups,
-            '# of comments': submission.num_comments,
-            'author': author_info['name'],
-            'created': pd.to_datetime(submission.created_utc, unit='s'),
-            'url': submission.url,
-            'content': submission.selftext,
-            'flair': submission.link_flair_text,
-            'subreddit': submission.subreddit.display_name,
-            'top comments': formatted_comments,
-            'highlighted_keywords': list(tags)
-        }
-
+        if skip is not None and sub_id in skip:
+            pass
+        elif journal is not None and journal.is_done(sub_id):
+            if journal_rows:
+                row = dict(journal.payload(sub_id))
+                row['created'] = pd.to_datetime(row['created'])
+                yield row
+        else:
+            term = tag(submission)
+            if term is None:
+                continue
+            pending.append((submission, term))
         count += 1
+        if seen is not None:
+            seen.add(sub_id)
+
         if limit and count >= limit:
             break
-
-    return list(results.values())
-
-
-def scrape_reddit(client, keywords, limit=None, subreddit='all', start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True):
+        if len(pending) >= reddit_authors.BATCH_SIZE:
+            yield from drain()
+    yield from drain()
+
+
+def _keyword_tagger(keywords, fallback=None):
+    matcher = keyword_matcher.matcher_for(keywords)
+
+    def tag(submission):
+        found = matcher.found(f"{submission.title}\n{submission.selftext}")
+        matched = [kw for kw in keywords if kw in found]
+        if matched:
+            return ", ".join(matched)
+        return fallback
+    return tag
+
+
+def iter_subreddit_posts(client, subreddit='all', limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, journal=None, keywords=None, authors=None, journal_rows=True, skip=None):
+    """Walk the newest posts of ``subreddit`` once, yielding rows as they are built.
+
+    With ``keywords`` only posts whose title or body contains at least one
+    of them are kept, and each row's 'search term' lists every keyword it
+    matched; posts that match nothing cost no author or comment request.
+    With a ``journal`` (a ``checkpoint.Checkpoint``) every kept post is
+    recorded as it completes and posts already in the journal are reused
+    without fetching their author or comments again. ``authors`` (a
+    ``reddit_authors.AuthorCache``) enables author karma and account age.
+    """
+    print(f"  Scanning subreddit '{subreddit}' with {'no limit' if limit is None else f'limit={limit}'}...")
+    tag = _keyword_tagger(keywords) if keywords else (lambda submission: 'ALL')
+    yield from _collect(client, client.subreddit(subreddit).new(limit=None), tag, 'new', limit, start_ts, end_ts,
+                        highlight_terms, fetch_comments, journal, authors, journal_rows=journal_rows, skip=skip)
+
+
+def search_all_subreddit_posts(client, subreddit='all', limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, journal=None, keywords=None, authors=None):
+    """List form of ``iter_subreddit_posts``."""
+    return list(iter_subreddit_posts(client, subreddit, limit, start_ts, end_ts, highlight_terms, fetch_comments, journal, keywords, authors))
+
+
+def _search_queries(keywords):
+    """OR-queries of quoted keywords, each within ``SEARCH_QUERY_MAX_LEN``."""
+    queries, chunk = [], []
+    for kw in keywords:
+        candidate = chunk + [kw]
+        if chunk and len(" OR ".join(f'"{k}"' for k in candidate)) > SEARCH_QUERY_MAX_LEN:
+            queries.append(chunk)
+            candidate = [kw]
+        chunk = candidate
+    if chunk:
+        queries.append(chunk)
+    return queries
+
+
+def iter_search_posts(client, keywords, subreddit='all', limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, journal=None, authors=None, journal_rows=True, skip=None):
+    """Keyword-driven alternative to the full scan, using Reddit search.
+
+    Keywords are batched into as few OR-queries as fit Reddit's query limit
+    and results are deduplicated across queries. Each row's 'search term'
+    lists the keywords found in the title or body (or the query's keywords
+    when Reddit matched on something else). Cheaper than a scan for rare
+    keywords; Reddit search may miss very recent posts.
+    """
+    sub = client.subreddit(subreddit)
+    seen = set()
+    for chunk in _search_queries(keywords):
+        if limit and len(seen) >= limit:
+            return
+        query = " OR ".join(f'"{kw}"' for kw in chunk)
+        print(f"  Searching '{subreddit}' for: {query}")
+        tag = _keyword_tagger(chunk, fallback=", ".join(chunk))
+        listing = sub.search(query, sort='new', time_filter='all', limit=None)
+        yield from _collect(client, listing, tag, 'search', limit - len(seen) if limit else None, start_ts, end_ts,
+                            highlight_terms, fetch_comments, journal, authors, seen, journal_rows, skip)
+
+
+def search_subreddit_posts(client, keywords, subreddit='all', limit=None, start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, journal=None, authors=None):
+    """List form of ``iter_search_posts``."""
+    return list(iter_search_posts(client, keywords, subreddit, limit, start_ts, end_ts, highlight_terms, fetch_comments, journal, authors))
+
+
+def _scan_term(keywords, mode):
+    if not keywords:
+        return 'ALL'
+    return ['search' if mode == 'search' else 'scan'] + sorted(keywords)
+
+
+def _scan_journal(subreddit, term, start_ts, resume):
+    # Keyed on what identifies the scan; end_ts defaults to "now" and would
+    # never match between the interrupted and the resumed run.
+    name = f"reddit_{storage.fingerprint(subreddit, term, start_ts)[:16]}"
+    return checkpoint.Checkpoint(name, resume=resume)
+
+
+def iter_reddit(client, keywords, limit=None, subreddit='all', start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, resume=False, mode='scan', enrich_authors=True, journal_rows=True, skip=None, journal=None):
+    """Yield post rows from ``subreddit`` in a single pass.
+
+    Without ``keywords`` every post is yielded. With ``keywords`` the
+    ``mode`` decides how: ``'scan'`` walks the newest-posts listing once and
+    tags each post with every keyword it contains; ``'search'`` uses Reddit
+    search (see ``iter_search_posts``). Posts are checkpointed; ``resume``
+    continues an interrupted run with the same subreddit, keywords, mode
+    and start date. ``enrich_authors=False`` skips author karma and account
+    age for fast scans; otherwise they come from the persistent author
+    cache and misses are fetched in batches. The checkpoint (``journal``,
+    opened here unless given) is removed once every row has been consumed.
+    """
+    scan_args = dict(subreddit=subreddit, limit=limit, start_ts=start_ts, end_ts=end_ts, highlight_terms=highlight_terms,
+                     fetch_comments=fetch_comments, journal_rows=journal_rows, skip=skip)
     if not keywords:
         print(f"\nScanning ALL posts in subreddit: '{subreddit}'")
-        posts = search_all_subreddit_posts(client, subreddit=subreddit, limit=limit, start_ts=start_ts, end_ts=end_ts, highlight_terms=highlight_terms, fetch_comments=fetch_comments)
-        return pd.DataFrame(posts)
+        collect = iter_subreddit_posts
+    elif mode == 'search':
+        print(f"\nSearching Reddit for {len(keywords)} keyword(s) in subreddit: '{subreddit}'")
+        collect = iter_search_posts
+        scan_args['keywords'] = keywords
+    else:
+        print(f"\nScanning subreddit '{subreddit}' once for {len(keywords)} keyword(s)")
+        collect = iter_subreddit_posts
+        scan_args['keywords'] = keywords
 
-    all_posts = []
-    for keyword in keywords:
-        print(f"\nSearching Reddit for keyword: '{keyword}' in subreddit: '{subreddit}'")
-        posts = search_all_subreddit_posts(client, subreddit=subreddit, limit=limit, start_ts=start_ts, end_ts=end_ts, highlight_terms=highlight_terms, fetch_comments=fetch_comments)
-        all_posts.extend(posts)
+    authors = reddit_authors.AuthorCache() if enrich_authors else None
+    if journal is None:
+        journal = _scan_journal(subreddit, _scan_term(keywords, mode), start_ts, resume)
+    try:
+        with journal:
+            yield from collect(client, journal=journal, authors=authors, **scan_args)
+    finally:
+        if authors is not None:
+            authors.save()
+    journal.complete()
 
-    if not all_posts:
+
+def scrape_reddit(client, keywords, limit=None, subreddit='all', start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, resume=False, mode='scan', enrich_authors=True):
+    """Collect the rows of ``iter_reddit`` into a DataFrame."""
+    posts = list(iter_reddit(client, keywords, limit, subreddit, start_ts, end_ts, highlight_terms, fetch_comments, resume, mode, enrich_authors))
+
+    if keywords and not posts:
         print("No posts found for the provided keywords.")
         return pd.DataFrame()
 
-    return pd.DataFrame(all_posts)
+    return pd.DataFrame(posts)
+
+
+OUTPUT_KEY = "__output__"  # journal entry holding a streamed scan's output path
+
+
+def stream_reddit(client, keywords, output_path, limit=None, subreddit='all', start_ts=None, end_ts=None, highlight_terms=None, fetch_comments=True, resume=False, mode='scan', enrich_authors=True):
+    """Write the rows of ``iter_reddit`` to ``output_path`` (CSV or JSONL) as they arrive.
+
+    Memory stays flat however long the scan runs: each row is written and
+    flushed as soon as it is built and only the summary totals are kept.
+    The output path is stored in the checkpoint, so ``resume`` reopens the
+    interrupted run's file (whatever ``output_path`` is now), skips every
+    post already in it and counts its rows into the stats. Returns
+    ``(stats, output_path)``.
+    """
+    journal = _scan_journal(subreddit, _scan_term(keywords, mode), start_ts, resume)
+    continuing = bool(resume and journal.payload(OUTPUT_KEY))
+    if continuing:
+        output_path = journal.payload(OUTPUT_KEY)
+    else:
+        journal.record(OUTPUT_KEY, output_path)
+        journal.flush()
+
+    stats, written = ScanStats(), set()
+    with row_writer.RowWriter(output_path, append=continuing) as writer:
+        if continuing:
+            # Read after the writer has cut any torn last row.
+            for row in row_writer.iter_rows(output_path):
+                if row.get('id') and row['id'] not in written:
+                    written.add(row['id'])
+                    stats.add(row)
+        for row in iter_reddit(client, keywords, limit, subreddit, start_ts, end_ts, highlight_terms, fetch_comments,
+                               resume, mode, enrich_authors, journal_rows=False, skip=written, journal=journal):
+            writer.write(row)
+            stats.add(row)
+            if stats.posts % STREAM_PROGRESS_EVERY == 0:
+                print(f"  {stats.posts} post(s) written to {output_path}")
+    return stats, output_path
 
 
 def get_keywords_from_user():
@@ -256,21 +564,27 @@ def run_reddit_search():
     if not summarize_inputs(keywords, subreddit, max_results, start_str, end_str, highlight_terms):
         print("Search cancelled.")
         return
+    mode = 'scan'
+    if keywords:
+        mode_input = input("Match keywords by (1) one scan of the newest posts or (2) Reddit search? [1]: ").strip()
+        mode = 'search' if mode_input == '2' else 'scan'
+    enrich_authors = input("Fetch author karma and account age (slower on first run)? (Y/N) [Y]: ").strip().lower() != 'n'
+    output_format = 'jsonl' if input("Output format, (1) CSV or (2) JSONL? [1]: ").strip() == '2' else 'csv'
+    resume = input("Resume an interrupted scan with these settings if one exists? (Y/N): ").strip().lower() == 'y'
 
     print("\nInitializing Reddit client...")
     reddit = init_reddit_client()
 
     print("Starting Reddit search. Please wait...\n")
-    df = scrape_reddit(reddit, keywords, limit=max_results, subreddit=subreddit, start_ts=start_ts, end_ts=end_ts, highlight_terms=highlight_terms)
+    date_str = datetime.datetime.now().strftime("%b%d").lower()
+    output_path = f"output/reddit_search_results_{date_str}.{output_format}"
+    summary_path = f"output/reddit_search_summary_{date_str}.txt"
+    stats, output_path = stream_reddit(reddit, keywords, output_path, limit=max_results, subreddit=subreddit, start_ts=start_ts, end_ts=end_ts, highlight_terms=highlight_terms, resume=resume, mode=mode, enrich_authors=enrich_authors)
 
-    if df.empty:
+    if not stats.posts:
         print("No posts were found for the given keywords.")
     else:
-        date_str = datetime.datetime.now().strftime("%b%d").lower()
-        output_path = f"output/reddit_search_results_{date_str}.csv"
-        summary_path = f"output/reddit_search_summary_{date_str}.txt"
-        df.to_csv(output_path, index=False)
-        summarize_scan(df, subreddit, start_str, end_str, highlight_terms, summary_path)
-        print(f"\nReddit search complete. Total posts found: {len(df)}")
+        write_scan_summary(stats, subreddit, start_str, end_str, summary_path)
+        print(f"\nReddit search complete. Total posts found: {stats.posts}")
         print(f"Results saved to: {output_path}")
         print(f"Summary saved to: {summary_path}")
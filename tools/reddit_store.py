@@ -0,0 +1,201 @@
+"""Local SQLite store of Reddit posts with per-subreddit high-water marks.
+
+Posts are keyed by their Reddit ID. For each subreddit the store keeps
+the newest ``created_utc`` synced so far, so ``sync_subreddit`` only walks
+the listing down to that mark instead of re-downloading the whole
+lookback window. Scores and comment counts of recent posts are refreshed
+by ``refresh_scores``, a separate pass that asks ``/api/info`` for 100
+posts per request. Lookback queries (``posts_since``) read from the store.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from . import rate_limit, reddit_search
+
+try:
+    import config
+except ImportError:  # pragma: no cover - config.py is optional for scrapers
+    config = None
+
+# =======================
+# SETTINGS
+# =======================
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+STORE_FILE = os.path.join(BASE_DIR, "data", "reddit_posts.db")
+
+# Only posts younger than this still gain meaningful votes and comments.
+REFRESH_MAX_AGE_DAYS = getattr(config, "REDDIT_REFRESH_MAX_AGE_DAYS", 3)
+REFRESH_MIN_INTERVAL = 3600  # seconds before a refreshed post is refreshed again
+INFO_BATCH_SIZE = 100  # fullnames per /api/info request
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id           TEXT PRIMARY KEY,
+    subreddit    TEXT NOT NULL,
+    created_utc  REAL NOT NULL,
+    refreshed_at REAL NOT NULL,
+    data         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posts_subreddit_created ON posts (subreddit, created_utc);
+CREATE TABLE IF NOT EXISTS sync_state (
+    subreddit  TEXT PRIMARY KEY,
+    high_water REAL NOT NULL,
+    synced_at  REAL NOT NULL
+);
+"""
+
+
+def _key(subreddit):
+    return (subreddit or "").strip().lower()
+
+
+def _created_utc(row):
+    created = row.get("created")
+    return float(pd.Timestamp(created).timestamp()) if created is not None else 0.0
+
+
+class RedditStore:
+    """Post rows (as built by ``reddit_search``) keyed by post ID.
+
+    One connection is shared by every thread and guarded by a lock.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # =======================
+    # WRITES
+    # =======================
+    def upsert_many(self, subreddit, rows):
+        """Store scraped rows for ``subreddit``; returns the newest ``created_utc`` among them."""
+        sub, now, newest = _key(subreddit), time.time(), None
+        with self._lock, self._conn:
+            for row in rows:
+                created = _created_utc(row)
+                newest = created if newest is None else max(newest, created)
+                self._conn.execute(
+                    "INSERT INTO posts (id, subreddit, created_utc, refreshed_at, data) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET refreshed_at = excluded.refreshed_at, data = excluded.data",
+                    (row["id"], sub, created, now, json.dumps(row, ensure_ascii=False, default=str)),
+                )
+        return newest
+
+    def set_high_water(self, subreddit, created_utc):
+        """Advance the newest-synced mark of ``subreddit`` (never moves it back)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (subreddit, high_water, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(subreddit) DO UPDATE SET high_water = MAX(high_water, excluded.high_water), "
+                "synced_at = excluded.synced_at",
+                (_key(subreddit), created_utc, time.time()),
+            )
+
+    def update_scores(self, updates):
+        """Apply ``(id, upvotes, num_comments)`` tuples to stored rows."""
+        now = time.time()
+        with self._lock, self._conn:
+            for post_id, upvotes, num_comments in updates:
+                row = self._conn.execute("SELECT data FROM posts WHERE id = ?", (post_id,)).fetchone()
+                if not row:
+                    continue
+                data = json.loads(row[0])
+                data["upvotes"], data["# of comments"] = upvotes, num_comments
+                self._conn.execute(
+                    "UPDATE posts SET data = ?, refreshed_at = ? WHERE id = ?",
+                    (json.dumps(data, ensure_ascii=False), now, post_id),
+                )
+
+    # =======================
+    # READS
+    # =======================
+    def high_water(self, subreddit):
+        with self._lock:
+            row = self._conn.execute("SELECT high_water FROM sync_state WHERE subreddit = ?", (_key(subreddit),)).fetchone()
+        return row[0] if row else None
+
+    def posts_since(self, subreddit, start_ts):
+        """Stored rows of ``subreddit`` created at or after ``start_ts``, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM posts WHERE subreddit = ? AND created_utc >= ? ORDER BY created_utc DESC",
+                (_key(subreddit), start_ts),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def refresh_candidates(self, subreddit, created_after, refreshed_before):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM posts WHERE subreddit = ? AND created_utc >= ? AND refreshed_at < ? "
+                "ORDER BY created_utc DESC",
+                (_key(subreddit), created_after, refreshed_before),
+            ).fetchall()
+        return [post_id for (post_id,) in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# =======================
+# SYNC & REFRESH
+# =======================
+def sync_subreddit(client, store, subreddit, start_ts, limit=None):
+    """Fetch posts newer than the stored high-water mark (or ``start_ts``) into ``store``.
+
+    Returns the number of posts fetched. When ``limit`` cuts the walk short
+    the mark still advances, so posts between the old mark and the oldest
+    fetched post are skipped; a warning says so.
+    """
+    mark = store.high_water(subreddit)
+    since = max(start_ts, mark) if mark else start_ts
+    df = reddit_search.scrape_reddit(
+        client, keywords=[], limit=limit, subreddit=subreddit, start_ts=since,
+        highlight_terms=None, fetch_comments=False, enrich_authors=False
+    )
+    rows = df.to_dict('records')
+    newest = store.upsert_many(subreddit, rows)
+    if newest is not None:
+        store.set_high_water(subreddit, newest)
+    if limit and len(rows) >= limit and mark:
+        print(f"⚠️ r/{subreddit}: limit of {limit} reached before the last sync point; older new posts were skipped.")
+    print(f"  r/{subreddit}: {len(rows)} new post(s) since {pd.to_datetime(since, unit='s')}")
+    return len(rows)
+
+
+def refresh_scores(client, store, subreddit, start_ts, max_age_days=REFRESH_MAX_AGE_DAYS):
+    """Refresh upvotes and comment counts of recent stored posts via ``client.info``.
+
+    Only posts created within ``max_age_days`` (and after ``start_ts``)
+    that were not refreshed in the last ``REFRESH_MIN_INTERVAL`` seconds
+    are requested, ``INFO_BATCH_SIZE`` per request.
+    """
+    now = time.time()
+    created_after = max(start_ts, now - max_age_days * 24 * 3600)
+    ids = store.refresh_candidates(subreddit, created_after, now - REFRESH_MIN_INTERVAL)
+    if not ids:
+        return 0
+    updates = []
+    for i in range(0, len(ids), INFO_BATCH_SIZE):
+        chunk = ids[i:i + INFO_BATCH_SIZE]
+        rate_limit.acquire("reddit")  # one /api/info request per chunk
+        for submission in client.info(fullnames=[f"t3_{post_id}" for post_id in chunk]):
+            updates.append((submission.id, submission.ups, submission.num_comments))
+        reddit_search.sync_rate_budget(client)
+    store.update_scores(updates)
+    print(f"  r/{subreddit}: refreshed scores of {len(updates)} post(s)")
+    return len(updates)
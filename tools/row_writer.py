@@ -0,0 +1,102 @@
+"""Streaming row output for long-running scans.
+
+``RowWriter`` appends each row to a CSV or JSONL file (chosen by the
+file extension) as soon as it is produced and flushes it to the OS, so
+memory use does not grow with the scan and an interrupted run keeps every
+row written so far. ``iter_rows`` reads such a file back one row at a time.
+"""
+import csv
+import json
+import os
+
+
+TAIL_BYTES = 1024 * 1024  # how far back a torn last row is looked for
+
+
+def is_jsonl(path):
+    return path.lower().endswith((".jsonl", ".ndjson"))
+
+
+def _drop_torn_line(path, terminator):
+    """Cut a partial last row left by a crash mid-write, so appends start clean.
+
+    CSV rows end in ``\r\n`` (the csv module's terminator), which the
+    ``\n`` inside multi-line fields does not match.
+    """
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - TAIL_BYTES)
+        f.seek(start)
+        tail = f.read()
+        if tail.endswith(terminator):
+            return
+        cut = tail.rfind(terminator)
+        f.truncate(start + cut + len(terminator) if cut >= 0 else 0)
+
+
+class RowWriter:
+    """Append rows to ``path``; use as a context manager.
+
+    CSV columns are taken from ``headers`` or the first row (keys missing
+    from a later row are left blank, extra keys are dropped). With
+    ``append=True`` an existing file is continued (minus any torn last
+    line) and, for CSV, its header is reused instead of being written again.
+    """
+
+    def __init__(self, path, headers=None, append=False):
+        self.path = path
+        self.headers = list(headers) if headers else None
+        self.jsonl = is_jsonl(path)
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            _drop_torn_line(path, b"\n" if self.jsonl else b"\r\n")
+        continuing = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if continuing and not self.jsonl and self.headers is None:
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                self.headers = next(csv.reader(f), None)
+        self._file = open(path, "a" if continuing else "w", newline="", encoding="utf-8")
+        self._writer = None
+        self._header_written = continuing
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def write(self, row):
+        if self.jsonl:
+            self._file.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        else:
+            if self._writer is None:
+                self.headers = self.headers or list(row.keys())
+                self._writer = csv.DictWriter(self._file, fieldnames=self.headers, extrasaction="ignore")
+                if not self._header_written:
+                    self._writer.writeheader()
+                    self._header_written = True
+            self._writer.writerow(row)
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def iter_rows(path):
+    """Yield the rows of a CSV or JSONL file written by ``RowWriter``."""
+    try:
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            if is_jsonl(path):
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash mid-write
+            else:
+                yield from csv.DictReader(f)
+    except FileNotFoundError:
+        return
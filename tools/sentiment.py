@@ -1,16 +1,13 @@
+from . import keyword_matcher
+
 POSITIVE = {"good", "great", "safe", "secure", "positive", "helpful"}
 NEGATIVE = {"bad", "unsafe", "scam", "risk", "negative", "hack", "problem"}
 
+_MATCHER = keyword_matcher.KeywordMatcher(sorted(POSITIVE | NEGATIVE))
+
 def score(text: str) -> int:
-    text = (text or "").lower()
-    s = 0
-    for w in POSITIVE:
-        if w in text:
-            s += 1
-    for w in NEGATIVE:
-        if w in text:
-            s -= 1
-    return s
+    found = _MATCHER.found(text or "")
+    return len(found & POSITIVE) - len(found & NEGATIVE)
 
 def tone(score_value: int) -> str:
     if score_value > 0:
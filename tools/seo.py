@@ -1,17 +1,27 @@
 import os
 from datetime import datetime
-from . import google_search, storage
+from . import google_search, storage, urls
 
 
 def serp_metadata(queries_file: str, top: int):
-    """Fetch metadata for top search results of given queries."""
+    """Fetch metadata for top search results of given queries.
+
+    Each record carries the ``url_id`` of its canonical URL, so results of
+    different runs can be joined; a URL repeated across queries is fetched
+    once.
+    """
     queries = storage.load_json(queries_file, [])
     all_results = []
+    seen = urls.UrlRegistry()
+    fetched = {}  # URL ID -> metadata
     for q in queries:
         results = google_search.search_google(q)[:top]
         for r in results:
-            meta = google_search.fetch_metadata(r['url'])
-            meta.update({'query': q, 'url': r['url']})
+            if seen.add(r['url']):
+                fetched[seen.id_for(r['url'])] = google_search.fetch_metadata(r['url'])
+            url_id = seen.id_for(r['url'])
+            meta = dict(fetched[url_id])
+            meta.update({'query': q, 'url': r['url'], 'url_id': url_id})
             all_results.append(meta)
     ts = datetime.utcnow().strftime('%Y%m%d_%H%M')
     out_path = os.path.join('output', f'serp_metadata_{ts}.json')
@@ -0,0 +1,91 @@
+"""Streaming sitemap reader.
+
+Sitemap indexes and their child sitemaps are downloaded in chunks and fed
+to an incremental XML parser, so every ``<url>`` entry is yielded as soon
+as it is read and a sitemap of any size is never held in memory at once.
+Gzipped sitemaps (``*.xml.gz``) are decompressed on the fly.
+"""
+import zlib
+from xml.etree.ElementTree import XMLPullParser
+
+from . import http_client
+
+CHUNK_SIZE = 64 * 1024
+
+XML_HEADERS = {
+    "Accept": "application/xml,text/xml;q=0.9,*/*;q=0.8",
+}
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iter_chunks(url):
+    response = http_client.get(url, headers=XML_HEADERS, stream=True)
+    try:
+        response.raise_for_status()
+        inflate = None
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if inflate is None:
+                # Sniff gzip by magic bytes: .xml.gz files are served without
+                # Content-Encoding, so requests does not decompress them.
+                inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == b"\x1f\x8b" else False
+            yield inflate.decompress(chunk) if inflate else chunk
+        if inflate:
+            yield inflate.flush()
+    finally:
+        response.close()
+
+
+def iter_entries(url):
+    """Yield ``(kind, loc, lastmod)`` for every entry of one sitemap file.
+
+    ``kind`` is ``"sitemap"`` for children of a sitemap index and ``"url"``
+    for pages; ``lastmod`` is the raw W3C datetime string or ``None``.
+    """
+    parser = XMLPullParser(events=("end",))
+    for chunk in _iter_chunks(url):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            kind = _local(elem.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in elem:
+                name = _local(child.tag)
+                if name == "loc":
+                    loc = (child.text or "").strip()
+                elif name == "lastmod":
+                    lastmod = (child.text or "").strip() or None
+            elem.clear()
+            if loc:
+                yield kind, loc, lastmod
+    parser.close()
+
+
+def iter_urls(index_url, sitemap_filter=None):
+    """Yield ``(loc, lastmod)`` for every page reachable from ``index_url``.
+
+    Nested indexes are followed depth first. ``sitemap_filter(loc)`` can skip
+    child sitemaps that cannot contain wanted pages. A child that fails to
+    download or parse is reported and skipped.
+    """
+    pending = [index_url]
+    seen = set()
+    while pending:
+        url = pending.pop()
+        if url in seen:
+            continue
+        seen.add(url)
+        children = []
+        try:
+            for kind, loc, lastmod in iter_entries(url):
+                if kind == "sitemap":
+                    if sitemap_filter is None or sitemap_filter(loc):
+                        children.append(loc)
+                else:
+                    yield loc, lastmod
+        except Exception as e:
+            print(f"⚠️ Skipping sitemap {url}: {e}")
+        pending.extend(reversed(children))
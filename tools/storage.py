@@ -1,4 +1,5 @@
 import csv
+import hashlib
 import json
 import os
 from datetime import datetime
@@ -53,4 +54,13 @@ def load_csv(path):
             reader = csv.DictReader(f)
             return list(reader)
     except FileNotFoundError:
-        return []
\ No newline at end of file
+        return []
+
+def fingerprint(*parts):
+    """Stable SHA-1 over JSON-serialisable parts, used to detect changed content."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def normalize_text(text):
+    """Collapse whitespace so layout-only changes do not alter a fingerprint."""
+    return ' '.join((text or '').split())
@@ -1,13 +1,16 @@
 import json
 
+from . import keyword_matcher
+
 def load_rules(path: str):
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 def classify(text: str, rules: dict) -> str:
-    text_l = (text or '').lower()
+    all_keywords = [kw for keywords in rules.values() for kw in keywords]
+    found = keyword_matcher.matcher_for(all_keywords).found(text or '')
     for theme, keywords in rules.items():
         for kw in keywords:
-            if kw.lower() in text_l:
+            if kw in found:
                 return theme
-    return None
\ No newline at end of file
+    return None
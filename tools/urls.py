@@ -0,0 +1,105 @@
+"""URL canonicalization and a hashed registry of seen URLs.
+
+Every module that stores, deduplicates or caches URLs goes through
+``canonicalize`` so the same page always has one spelling, and through
+``UrlRegistry`` for constant-time "seen before?" checks with stable IDs.
+"""
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_SCHEME = "https"
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# Query parameters that only track the click and never change the page.
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "igshid"}
+TRACKING_PREFIXES = ("utm_",)
+
+# Characters left unescaped when the query string is re-encoded.
+QUERY_SAFE = ":/@!$'()*,;"
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize(url):
+    """Return the canonical spelling of ``url`` ("" for blank input).
+
+    Repairs a URL glued onto a site prefix ("https://a.comhttps://a.com/x"),
+    adds a missing scheme, lowercases scheme and host, drops default ports,
+    fragments and tracking parameters, and sorts the query string. The path
+    (including any trailing slash) is kept as is. Relative paths ("/x")
+    are returned stripped but otherwise unchanged.
+    """
+    url = (url or "").strip()
+    if not url or (url.startswith("/") and not url.startswith("//")):
+        return url
+    for marker in ("https://", "http://"):
+        pos = url.find(marker, 1)
+        # Only a URL glued directly onto a bare origin, not one in a query.
+        if pos > 0 and not any(c in url[:pos].split("://", 1)[-1] for c in "/?#"):
+            url = url[pos:]
+            break
+    if url.startswith("//"):
+        url = f"{DEFAULT_SCHEME}:{url}"
+    elif "://" not in url:
+        url = f"{DEFAULT_SCHEME}://{url}"
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or str(port) == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)
+    ), safe=QUERY_SAFE)
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def domain(url):
+    """Host of ``url`` without a leading "www." or port, lowercased."""
+    host = (urlsplit(url if "://" in (url or "") else f"//{url or ''}").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def path_segments(url):
+    """Non-empty path segments of ``url``."""
+    return [p for p in urlsplit(url or "").path.split("/") if p]
+
+
+def url_id(url):
+    """Stable 16-hex-digit ID of the canonical form of ``url``."""
+    return hashlib.sha1(canonicalize(url).encode("utf-8")).hexdigest()[:16]
+
+
+class UrlRegistry:
+    """Set of canonical URLs with stable IDs and O(1) membership checks."""
+
+    def __init__(self, urls=()):
+        self._ids = {}
+        for url in urls:
+            self.add(url)
+
+    def add(self, url):
+        """Register ``url``; returns ``True`` if it was not seen before."""
+        canonical = canonicalize(url)
+        if not canonical or canonical in self._ids:
+            return False
+        self._ids[canonical] = url_id(canonical)
+        return True
+
+    def id_for(self, url):
+        """ID of ``url`` if registered, else ``None``."""
+        return self._ids.get(canonicalize(url))
+
+    def __contains__(self, url):
+        return canonicalize(url) in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
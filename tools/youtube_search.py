@@ -1,12 +1,13 @@
 import os
 import json
 import csv
-import time
 import googleapiclient.discovery
 import googleapiclient.errors
 from urllib.parse import urlparse, parse_qs
 import config
 
+from . import checkpoint, keyword_matcher, rate_limit
+
 API_KEY = config.API_KEY
 
 # ==========================
@@ -23,6 +24,7 @@ def get_youtube_comments(youtube, video_id, keywords, channel_name, video_title,
     """Fetches comments from a YouTube video, optionally filtering by keywords unless in raw mode."""
     comments = []
     next_page_token = None
+    matcher = keyword_matcher.matcher_for(keywords)
 
     while True:
         try:
@@ -32,6 +34,7 @@ def get_youtube_comments(youtube, video_id, keywords, channel_name, video_title,
                 maxResults=100,
                 pageToken=next_page_token
             )
+            rate_limit.acquire("youtube")
             response = request.execute()
 
             for item in response.get("items", []):
@@ -46,7 +49,7 @@ def get_youtube_comments(youtube, video_id, keywords, channel_name, video_title,
                     # In raw mode, we don't filter out any comments.
                     matched_keyword = "RAW"
                 else:
-                    matched_keyword = next((kw for kw in keywords if kw.lower() in comment_text.lower()), None)
+                    matched_keyword = matcher.first(comment_text)
 
                 # Only add the comment if raw_mode is True or if a keyword matched.
                 if raw_mode or matched_keyword:
@@ -82,8 +85,6 @@ def get_youtube_comments(youtube, video_id, keywords, channel_name, video_title,
             if not next_page_token:
                 break
 
-            time.sleep(1)  # Respect API rate limits
-
         except googleapiclient.errors.HttpError as e:
             error_message = str(e)
             if "commentsDisabled" in error_message:
@@ -213,8 +214,36 @@ def get_channel_videos(youtube, channel_id):
 
     return video_ids
 
-def run_channel_wide_search(channel_url_or_id, keywords, raw_mode=False):
-    """Fetches all videos from a channel, scrapes their comments, and writes them to one CSV file."""
+def _channel_video_comments(youtube, video_id, keywords, raw_mode):
+    """Return the comments of one channel video ([] when it has none)."""
+    # Fetch video metadata
+    request = youtube.videos().list(
+        part="snippet",
+        id=video_id
+    )
+    response = request.execute()
+
+    if not response.get("items"):
+        print(f"❌ Error: No video found with ID {video_id}.")
+        return []
+
+    snippet = response["items"][0]["snippet"]
+    channel_name = snippet["channelTitle"]
+    video_title = snippet["title"]
+    video_owner_id = snippet["channelId"]
+
+    print(f"🔍 Scraping comments for: {video_title} ({video_id})")
+    comments = get_youtube_comments(youtube, video_id, keywords, channel_name, video_title, video_owner_id, raw_mode)
+    if not comments:
+        print(f"No comments found for video: {video_title}.")
+    return comments
+
+def run_channel_wide_search(channel_url_or_id, keywords, raw_mode=False, resume=False):
+    """Fetches all videos from a channel, scrapes their comments, and writes them to one CSV file.
+
+    Each finished video's comments are journalled in a checkpoint, so with
+    ``resume`` an interrupted run only fetches the videos it had not reached.
+    """
     youtube = get_youtube_client()
     channel_id = extract_channel_id(youtube, channel_url_or_id)
 
@@ -228,35 +257,20 @@ def run_channel_wide_search(channel_url_or_id, keywords, raw_mode=False):
         print("Error: No videos found for this channel.")
         return
 
-    all_comments = []
+    journal = checkpoint.Checkpoint(f"youtube_{channel_id}{'_raw' if raw_mode else ''}", resume=resume)
+    all_comments = [c for comments in journal.payloads() for c in comments or []]
     
-    for video_id in video_ids:
-        # Fetch video metadata
-        request = youtube.videos().list(
-            part="snippet",
-            id=video_id
-        )
-        response = request.execute()
-
-        if not response.get("items"):
-            print(f"❌ Error: No video found with ID {video_id}.")
-            continue
-
-        snippet = response["items"][0]["snippet"]
-        channel_name = snippet["channelTitle"]
-        video_title = snippet["title"]
-        video_owner_id = snippet["channelId"]
-
-        print(f"🔍 Scraping comments for: {video_title} ({video_id})")
-        comments = get_youtube_comments(youtube, video_id, keywords, channel_name, video_title, video_owner_id, raw_mode)
-        
-        if comments:
+    with journal:
+        for video_id in video_ids:
+            if journal.is_done(video_id):
+                continue
+            comments = _channel_video_comments(youtube, video_id, keywords, raw_mode)
+            journal.record(video_id, comments)
             all_comments.extend(comments)
-        else:
-            print(f"No comments found for video: {video_title}.")
 
     if not all_comments:
         print("No comments found for the channel.")
+        journal.complete()
         return
 
     if raw_mode:
@@ -271,4 +285,5 @@ def run_channel_wide_search(channel_url_or_id, keywords, raw_mode=False):
         writer.writeheader()
         writer.writerows(all_comments)
 
+    journal.complete()
     print(f"✅ Channel-wide comments saved to {output_file}")